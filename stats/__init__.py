@@ -0,0 +1,96 @@
+""" Package for playing with writing statistical methods.
+
+The subpackages and their classes are imported lazily, on first access,
+so `import stats` does not pull in NumPy. For example `stats.PValue`
+imports `stats.inferential_stats.pvalue` the first time it is used.
+"""
+
+import importlib
+
+# Class or function -> subpackage that exposes it.
+_ATTRIBUTES = {
+    'ANOVA' : 'inferential_stats',
+    'Bootstrap' : 'inferential_stats',
+    'ChiSquare' : 'inferential_stats',
+    'ChunkedCorrection' : 'inferential_stats',
+    'ClassicalHypothesis' : 'inferential_stats',
+    'Contingency' : 'inferential_stats',
+    'DiffOfMeans' : 'inferential_stats',
+    'DiffOfProportions' : 'inferential_stats',
+    'DiffOfProportionsBatch' : 'inferential_stats',
+    'GoodnessOfFit' : 'inferential_stats',
+    'GroupedOneSampleDifferenceMeans' : 'inferential_stats',
+    'GroupedOneSampleDifferenceProportions' : 'inferential_stats',
+    'KolmogorovSmirnov' : 'inferential_stats',
+    'KruskalWallis' : 'inferential_stats',
+    'MatchedPairs' : 'inferential_stats',
+    'OneSampleDifferenceMeans' : 'inferential_stats',
+    'OneSampleDifferenceProportions' : 'inferential_stats',
+    'PValue' : 'inferential_stats',
+    'PValueBatch' : 'inferential_stats',
+    'PermutationTest' : 'inferential_stats',
+    'RunningMoments' : 'inferential_stats',
+    'TTest' : 'inferential_stats',
+    'WilcoxonRankSum' : 'inferential_stats',
+    'WilcoxonSignedRanks' : 'inferential_stats',
+    'ZTest' : 'inferential_stats',
+    'ZTestBatch' : 'inferential_stats',
+    'benjamini_hochberg' : 'inferential_stats',
+    'bonferroni' : 'inferential_stats',
+    'holm' : 'inferential_stats',
+    'JointCountBinary' : 'inferential_spatial_stats',
+    'MoransIndexGlobal' : 'inferential_spatial_stats',
+    'NearestNeighbor' : 'inferential_spatial_stats',
+    'Quadrant' : 'inferential_spatial_stats',
+    'PearsonCorrelation' : 'relationships',
+    'SpearmanRankCorrelation' : 'relationships',
+    'LoadChi2Table' : 'tables',
+    'LoadFTable' : 'tables',
+    'LoadNormalTable' : 'tables',
+    'LoadStudentsTTable' : 'tables',
+}
+
+_SUBPACKAGES = ('inferential_spatial_stats', 'inferential_stats',
+                'relationships', 'tables')
+
+
+def lazy_attributes(package, attributes):
+    """ Build the module-level `__getattr__` and `__dir__` of a package
+    whose attributes are imported on first access (PEP 562).
+
+    Parameters
+    ----------
+    package : str
+        Name of the package, i.e. its `__name__`.
+    attributes : dict
+        Attribute name -> name of the submodule, relative to `package`,
+        that defines it.
+
+    Returns
+    -------
+    __getattr__, __dir__ : functions
+    """
+    module = importlib.import_module(package)
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError("module '{}' has no attribute '{}'".format(
+                package, name))
+        submodule = importlib.import_module('.' + attributes[name], package)
+        if attributes[name] == name:
+            value = submodule
+        else:
+            value = getattr(submodule, name)
+        # Cache on the package so later lookups skip __getattr__.
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(attributes))
+
+    return __getattr__, __dir__
+
+
+__getattr__, __dir__ = lazy_attributes(__name__,
+    dict(_ATTRIBUTES, **{name : name for name in _SUBPACKAGES}))
+__all__ = sorted(_ATTRIBUTES)
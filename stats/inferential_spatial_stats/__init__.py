@@ -0,0 +1,15 @@
+""" Inferential spatial statistics tests. Classes are imported on first
+access.
+"""
+
+from stats import lazy_attributes
+
+_ATTRIBUTES = {
+    'JointCountBinary' : 'area_pattern_analysis',
+    'MoransIndexGlobal' : 'area_pattern_analysis',
+    'NearestNeighbor' : 'nearest_neighbor',
+    'Quadrant' : 'quadrant',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
+__all__ = sorted(_ATTRIBUTES)
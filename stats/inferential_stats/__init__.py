@@ -0,0 +1,39 @@
+""" Inferential statistics tests. Classes are imported on first access.
+"""
+
+from stats import lazy_attributes
+
+_ATTRIBUTES = {
+    'Bootstrap' : 'bootstrap',
+    'ChiSquare' : 'categorical',
+    'Contingency' : 'categorical',
+    'GoodnessOfFit' : 'categorical',
+    'KolmogorovSmirnov' : 'categorical',
+    'ClassicalHypothesis' : 'classical_hypothesis',
+    'MatchedPairs' : 'matchedpairs',
+    'TTest' : 'matchedpairs',
+    'WilcoxonSignedRanks' : 'matchedpairs',
+    'RunningMoments' : 'moments',
+    'ANOVA' : 'multisample',
+    'KruskalWallis' : 'multisample',
+    'ChunkedCorrection' : 'multiple_testing',
+    'benjamini_hochberg' : 'multiple_testing',
+    'bonferroni' : 'multiple_testing',
+    'holm' : 'multiple_testing',
+    'PermutationTest' : 'permutation',
+    'GroupedOneSampleDifferenceMeans' : 'onesample',
+    'GroupedOneSampleDifferenceProportions' : 'onesample',
+    'OneSampleDifferenceMeans' : 'onesample',
+    'OneSampleDifferenceProportions' : 'onesample',
+    'PValue' : 'pvalue',
+    'PValueBatch' : 'pvalue',
+    'DiffOfMeans' : 'twosample',
+    'DiffOfProportions' : 'twosample',
+    'DiffOfProportionsBatch' : 'twosample',
+    'WilcoxonRankSum' : 'twosample',
+    'ZTest' : 'twosample',
+    'ZTestBatch' : 'twosample',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
+__all__ = sorted(_ATTRIBUTES)
@@ -0,0 +1,255 @@
+""" Bootstrap confidence intervals.
+
+The samples are resampled with replacement in chunks. Each chunk draws
+one 2-D index array per sample (one resample per row) and evaluates the
+statistic on all rows at once; the chunk size is set by a memory budget.
+A sample may be 2-D, with one row per unit and one column per metric,
+so one run gives intervals for every metric. Chunks can be spread over a
+process pool, each with its own seed spawned from one
+`np.random.SeedSequence`.
+
+The named statistics are those of the existing tests:
+
+    'mean'                   `OneSampleDifferenceMeans`
+    'proportion'             `OneSampleDifferenceProportions`
+    'mean_difference'        `ZTest`
+    'proportion_difference'  `DiffOfProportions`
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    B. Efron, "Better Bootstrap Confidence Intervals", 1987
+
+    B. Efron and R.J. Tibshirani, "An Introduction to the Bootstrap", 1993
+
+"""
+
+import numpy as np
+from stats.inferential_stats.parallel import map_blocks
+from stats.tables.distributions import norm_cdf, norm_ppf
+
+# Bytes of resampled values (or, for the named statistics, resampled
+# indices and counts) held at once.
+BOOTSTRAP_BYTES = 2**27
+
+METHODS = ('percentile', 'bca')
+
+
+def mean(x):
+    """ Mean along axis 1 (the units of each resample).
+    """
+    return x.mean(axis=1)
+
+def mean_difference(x1, x2):
+    """ Difference of the means along axis 1.
+    """
+    return x1.mean(axis=1) - x2.mean(axis=1)
+
+STATISTICS = {
+    'mean' : mean,
+    'proportion' : mean,
+    'mean_difference' : mean_difference,
+    'proportion_difference' : mean_difference,
+}
+
+
+class Bootstrap(object):
+    """ Bootstrap distribution of a statistic, with percentile and BCa
+    (bias-corrected and accelerated) intervals.
+    """
+    def __init__(self, samples, statistic='mean', n_resamples=10000,
+                 max_bytes=BOOTSTRAP_BYTES, workers=None, seed=None):
+        """
+        Parameters
+        ----------
+        samples : array, or list of arrays
+            The sample, or one array per sample. Units run along the first
+            axis; further axes (e.g., metrics) are kept.
+        statistic : {'mean', 'proportion', 'mean_difference',
+                     'proportion_difference'} or function
+            The statistic. A function takes one array per sample, each of
+            shape (resamples, units, ...), reduces axis 1, and must be
+            defined at module level to reach the workers.
+        n_resamples : int
+            Number of resamples.
+        max_bytes : int
+            Memory budget of the resampled values of one chunk.
+        workers : int
+            Number of processes. By default, chunks run in this process.
+        seed : int or np.random.SeedSequence
+            Seeds the resamples.
+        """
+        if isinstance(samples, (list, tuple)):
+            samples = tuple(np.asarray(sample, dtype=float) for sample in samples)
+        else:
+            samples = (np.asarray(samples, dtype=float),)
+        self._mean_based = not callable(statistic)
+        if self._mean_based:
+            if statistic not in STATISTICS:
+                raise ValueError("statistic must be one of {} or a function, "
+                                 "not '{}'".format(sorted(STATISTICS), statistic))
+            statistic = STATISTICS[statistic]
+            if len(samples) != statistic.__code__.co_argcount:
+                raise ValueError("'{}' takes {} sample(s), not {}".format(
+                    statistic.__name__, statistic.__code__.co_argcount, len(samples)))
+
+        self.samples = samples
+        self.statistic = statistic
+        self.n_resamples = n_resamples
+        self.workers = workers
+        self.seed = seed
+        if self._mean_based:
+            # Indices and counts per unit, and a mean per metric.
+            bytes_per_resample = sum(16 * sample.shape[0] + 8 * sample[0].size
+                                     for sample in samples)
+        else:
+            bytes_per_resample = sum(8 * sample.size for sample in samples)
+        self.chunk_size = int(max(1, min(n_resamples,
+                                         max_bytes // bytes_per_resample)))
+        self.observed = np.asarray(statistic(*[sample[None] for sample in samples]))[0]
+        # Sorted once, for the quantiles.
+        self.replicates = np.sort(self._resample(), axis=0)
+
+    def _resample(self):
+        state = (self.samples, self.statistic, self._mean_based)
+        return np.concatenate(list(map_blocks(_replicate, state, self.n_resamples,
+                                              self.chunk_size, self.seed,
+                                              self.workers)))
+
+    @property
+    def standard_error(self):
+        return self.replicates.std(axis=0, ddof=1)
+
+    def interval(self, confidence=0.95, method='bca'):
+        """ Confidence interval of the statistic.
+
+        Parameters
+        ----------
+        confidence : float
+            Confidence level, e.g. 0.95.
+        method : {'percentile', 'bca'}
+            The kind of interval.
+
+        Returns
+        -------
+        lower, upper : float or array
+            One entry per metric.
+        """
+        if method == 'percentile':
+            return self.percentile(confidence)
+        elif method == 'bca':
+            return self.bca(confidence)
+        raise ValueError("method must be one of {}, not '{}'".format(METHODS, method))
+
+    def percentile(self, confidence=0.95):
+        """ Percentile interval: the quantiles of the replicates.
+        """
+        tail = (1 - confidence) / 2.0
+        shape = self.observed.shape
+        return (_quantile(self.replicates, np.full(shape, tail)),
+                _quantile(self.replicates, np.full(shape, 1 - tail)))
+
+    def bca(self, confidence=0.95):
+        """ BCa interval: quantiles of the replicates shifted for bias and
+        skewness. Falls back to `percentile` where the replicates are all
+        on one side of the observed statistic.
+        """
+        tail = (1 - confidence) / 2.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z0 = norm_ppf(np.mean(self.replicates < self.observed, axis=0))
+            a = self.acceleration()
+            levels = []
+            for z in (norm_ppf(tail), norm_ppf(1 - tail)):
+                level = norm_cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+                level = np.where(np.isfinite(level), level, norm_cdf(z))
+                levels.append(level)
+        return (_quantile(self.replicates, levels[0]),
+                _quantile(self.replicates, levels[1]))
+
+    def acceleration(self):
+        """ The BCa acceleration, from the jackknife of every sample.
+        """
+        numerator = 0.0
+        denominator = 0.0
+        for estimates in self.jackknife():
+            n = estimates.shape[0]
+            U = (n - 1) * (estimates.mean(axis=0) - estimates)
+            numerator = numerator + np.sum(U**3, axis=0) / n**3
+            denominator = denominator + np.sum(U**2, axis=0) / n**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return numerator / (6 * denominator**1.5)
+
+    def jackknife(self):
+        """ Leave-one-out estimates, one array per sample (each leaving
+        out the units of that sample in turn).
+        """
+        samples = self.samples
+        estimates = []
+        for i, sample in enumerate(samples):
+            n = sample.shape[0]
+            if self._mean_based:
+                # The mean of a single "unit" holding the leave-one-out mean.
+                rows = [((sample.sum(axis=0) - sample) / (n - 1.0))[:, None]]
+            else:
+                rows = _leave_one_out(sample, self.chunk_size)
+            parts = []
+            for part in rows:
+                args = [np.broadcast_to(s[None], (part.shape[0],) + s.shape)
+                        for s in samples]
+                args[i] = part
+                parts.append(np.asarray(self.statistic(*args)))
+            estimates.append(np.concatenate(parts))
+        return estimates
+
+
+def _replicate(state, size, seed):
+    """ The statistic of `size` resamples of every sample.
+    """
+    samples, statistic, mean_based = state
+    rng = np.random.default_rng(seed)
+    resamples = []
+    for sample in samples:
+        n = sample.shape[0]
+        index = rng.integers(0, n, (size, n))
+        if mean_based:
+            # Resample means as counts times values: one matrix product
+            # instead of gathering every resampled value.
+            counts = np.bincount((index + n * np.arange(size)[:, None]).ravel(),
+                                 minlength=size * n).reshape(size, n)
+            means = counts.dot(sample.reshape(n, -1)) / float(n)
+            resamples.append(means.reshape((size, 1) + sample.shape[1:]))
+        else:
+            resamples.append(sample[index])
+    return np.asarray(statistic(*resamples))
+
+def _leave_one_out(sample, chunk_size):
+    """ Yield the leave-one-out samples, `chunk_size` at a time. Row j of
+    a chunk holds every unit but j; its indices are built per chunk, so
+    memory stays within the budget.
+    """
+    n = sample.shape[0]
+    keep = np.arange(n - 1)
+    for start in range(0, n, chunk_size):
+        left_out = np.arange(start, min(start + chunk_size, n))
+        yield sample[keep[None, :] + (keep[None, :] >= left_out[:, None])]
+
+def _quantile(replicates, levels):
+    """ Quantiles of the sorted replicates along axis 0, at a level per
+    metric (linear interpolation, as `np.quantile`).
+    """
+    ordered = replicates
+    levels = np.asarray(levels, dtype=float)
+    position = levels * (ordered.shape[0] - 1)
+    lo = np.floor(position).astype(int)
+    hi = np.minimum(lo + 1, ordered.shape[0] - 1)
+    lower = np.take_along_axis(ordered, lo[None], axis=0)[0]
+    upper = np.take_along_axis(ordered, hi[None], axis=0)[0]
+    result = lower + (position - lo) * (upper - lower)
+    return result if result.ndim else float(result)
@@ -18,11 +18,12 @@ References:
 from __future__ import print_function
 
 import numpy as np
+from stats.tables.critical_values import critical_value
 
 
 class ClassicalHypothesis(object):
 
-    def __init__(self, hyp_val, val, n, stddev, alpha, rejection):
+    def __init__(self, hyp_val, val, n, stddev, alpha, rejection, backend='table'):
         """
 
         Parameters
@@ -43,6 +44,8 @@ class ClassicalHypothesis(object):
             If 2, two-tailed, equals alpha/2 on each side.
             If 1, one-tailed, equals alpha on positive side.
             If -1, one-tailed, equals alpha on negative side.
+        backend : {'table', 'analytic'}
+            How critical values are looked up.
         """
 
         #  null hypthesis : val - hyp_val = 0
@@ -52,6 +55,8 @@ class ClassicalHypothesis(object):
         self.stddev = stddev
         self.alpha = alpha
         self.rejection = rejection
+        self.backend = backend
+        self.critical_value = None
 
         self.test_stat = self.test_statistic()
         self.decision = self.make_decision()
@@ -81,23 +86,23 @@ class ClassicalHypothesis(object):
         decision : {True, False}
             Rejection or acceptance of null hypothesis.
         """
-        # Calculate rejection region
-        rejection_region = self.alpha / float(self.rejection)
-
-        # Calculate critical value.
+        # Look up critical value for the rejection region (cached).
+        tails = abs(self.rejection)
         if self.n >= 30:
-            # Should use rejection region to look up appropriate Z-value.
-            # Let's say it is roughly
-            critical_value = 1.65  # +/-
+            self.critical_value = critical_value('normal', self.alpha, tails,
+                backend=self.backend)
         elif self.n < 30:
-            # Should use rejection region to look up appropriate t-value
-            # for given n. Let's say it is roughly 
-            critical_value = 2.06  # +/-
-        
+            self.critical_value = critical_value('t', self.alpha, tails,
+                df=self.n - 1, backend=self.backend)
+
         # Make decision to accept (True) or reject (False).
         # Always assume null hypothesis is True.
         decision = True
-        if abs(self.test_stat) >= critical_value:
+        if self.rejection == 2 and abs(self.test_stat) >= self.critical_value:
+            decision = False
+        elif self.rejection == 1 and self.test_stat >= self.critical_value:
+            decision = False
+        elif self.rejection == -1 and self.test_stat <= -self.critical_value:
             decision = False
 
         return decision
@@ -130,8 +135,9 @@ class OneSampleDifferenceMeans(ClassicalHypothesis):
         if SampleSize < 30, use t
         if SampleSize >= 30, use Z
     """
-    def __init__(self, hyp_mean, mean, n, stddev, alpha, rejection):
-        ClassicalHypothesis.__init__(self, hyp_mean, mean, n, stddev, alpha, rejection)
+    def __init__(self, hyp_mean, mean, n, stddev, alpha, rejection, backend='table'):
+        ClassicalHypothesis.__init__(self, hyp_mean, mean, n, stddev, alpha,
+            rejection, backend)
         self.hyp_mean = hyp_mean
         self.mean = mean
 
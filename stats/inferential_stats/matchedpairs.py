@@ -15,7 +15,17 @@ References:
 
 """
 
+from itertools import zip_longest
+
 import numpy as np
+from stats.inferential_stats.moments import CHUNK_SIZE, RunningMoments, iter_chunks
+from stats.inferential_stats.pvalue import PValue
+from stats.inferential_stats.ranks import rank_with_ties, tie_correction
+from stats.tables import exact_rank_tables
+
+# Largest number of nonzero differences for which the exact distribution
+# of the signed-rank statistic is used by default.
+EXACT_MAX_N = 50
 
 
 class MatchedPairs(object):
@@ -66,7 +76,8 @@ class TTest(MatchedPairs):
         VarianceOfMatchedPair = sqrt( sum(DifferencesForMatchedPair_i - MeanOfMatched-PairDifferences)^2 /
                                        (NumberSamples - 1))
 
-
+    The differences keep their signs. Only their count, mean and sum of
+    squared deviations are needed, so `from_pairs` streams them in chunks.
     """
     def __init__(self, n, x, y):
         MatchedPairs.__init__(self, n)
@@ -78,8 +89,46 @@ class TTest(MatchedPairs):
         y : array
             Second variable in matched-pairs.
         """
-        self.x = np.asarray(x)
-        self.y = np.asarray(y)
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.moments = RunningMoments().update(self.x - self.y)
+        self._test()
+
+    @classmethod
+    def from_pairs(cls, x, y, chunk_size=CHUNK_SIZE):
+        """ Test paired data in one pass over the differences, holding one
+        chunk at a time.
+
+        Parameters
+        ----------
+        x, y : array, iterable of floats, or iterable of arrays
+            The paired variables. Generators of chunks must yield chunks
+            of the same size for both.
+        chunk_size : int
+            Number of pairs reduced at a time.
+        """
+        moments = RunningMoments()
+        for x_chunk, y_chunk in zip_longest(iter_chunks(x, chunk_size),
+                                            iter_chunks(y, chunk_size)):
+            if x_chunk is None or y_chunk is None or x_chunk.size != y_chunk.size:
+                raise ValueError("x and y must have the same number of values, "
+                                 "in chunks of the same size")
+            moments.update(x_chunk - y_chunk)
+        return cls.from_moments(moments)
+
+    @classmethod
+    def from_moments(cls, moments):
+        """ Test from the `RunningMoments` of the differences.
+        """
+        ttest = cls.__new__(cls)
+        MatchedPairs.__init__(ttest, moments.n)
+        ttest.x = None
+        ttest.y = None
+        ttest.moments = moments
+        ttest._test()
+        return ttest
+
+    def _test(self):
         self.d = self.mean_differences()
         self.sigma = self.standard_error()
         self.t_mp = None
@@ -87,17 +136,15 @@ class TTest(MatchedPairs):
         self.test_stat = self.t_mp
 
     def mean_differences(self):
+        """ Size of the mean difference.
         """
-        """
-        d = abs(np.mean(self.x) - np.mean(self.y))
+        d = abs(self.moments.mean)
         return d
 
     def standard_error(self):
+        """ Standard error of the mean difference.
         """
-        """
-        d_i_2 = np.array([(self.x[i] - self.y[i])**2 for i in range(len(self.x))])
-        d_i = np.array([abs(self.x[i] - self.y[i]) for i in range(len(self.x))])
-        s = np.sqrt( (sum(d_i_2) - ((sum(d_i))**2 / self.n )) / (self.n - 1) )
+        s = self.moments.stddev(ddof=1)
         if self.n <= 10:
             sigma = s / np.sqrt(self.n - 1)
         else:
@@ -139,9 +186,13 @@ class WilcoxonSignedRanks(MatchedPairs):
 
         RankSum = min(PostiveRankeSum, NegativeRankSum)
 
+        With ties, the variance is reduced by sum(T) / 48, where
+        T = t^3 - t for each group of t tied absolute differences.
 
+    For n <= 10, Z_w is not computed; `pvalue` then uses the exact
+    distribution of the rank sum.
     """
-    def __init__(self, n, Tp, Tn):
+    def __init__(self, n, Tp, Tn, ties=0):
         MatchedPairs.__init__(self, n)
         """
         Parameters
@@ -150,9 +201,12 @@ class WilcoxonSignedRanks(MatchedPairs):
             Ranked sum of negative differences.
         Tp : int
             Ranked sum of positive differences.
+        ties : float
+            sum(t^3 - t) over the groups of tied absolute differences.
         """
         self.Tn = Tn
         self.Tp = Tp
+        self.ties = ties
         self.T = np.min([Tn, Tp])
         self.Zw = None
 
@@ -161,13 +215,62 @@ class WilcoxonSignedRanks(MatchedPairs):
 
         self.test_stat = self.Zw
 
+    @classmethod
+    def from_pairs(cls, x, y):
+        """ Rank the nonzero differences x - y by size (average ranks for
+        ties) and test.
+
+        Parameters
+        ----------
+        x, y : array
+            The paired variables.
+        """
+        d = np.asarray(x, dtype=float).ravel() - np.asarray(y, dtype=float).ravel()
+        d = d[d != 0]
+        ranks, tie_counts = rank_with_ties(np.abs(d))
+        Tp = ranks[d > 0].sum()
+        Tn = ranks[d < 0].sum()
+        return cls(d.size, Tp, Tn, tie_correction(tie_counts))
+
+    def standard_deviation(self):
+        n = self.n
+        variance = n*(n + 1)*(2*n + 1)/24.0 - self.ties / 48.0
+        return np.sqrt(variance)
+
     def test_statistic(self):
         """
         """
         T = self.T
         n = self.n
-        self.Zw = (T - n*(n + 1) / 4.0)/ \
-            np.sqrt( n*(n + 1)*(2*n + 1)/24.0 )
+        self.Zw = (T - n*(n + 1) / 4.0) / self.standard_deviation()
+
+    def pvalue(self, rejection=2, exact=None, **kwargs):
+        """ The p-value of the rank sums.
+
+        Parameters
+        ----------
+        rejection : int
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the positive differences rank higher (large Tp). If -1,
+            the negative differences rank higher.
+        exact : {None, True, False}
+            Use the exact distribution of Tp (which assumes no ties). By
+            default, it is used for at most `EXACT_MAX_N` differences
+            without ties.
+        kwargs :
+            Passed on to `PValue`, e.g. `backend`.
+        """
+        if exact is None:
+            exact = self.n <= EXACT_MAX_N and not self.ties
+        if exact:
+            return exact_rank_tables.signed_rank_pvalue(self.Tp, self.n, rejection)
+
+        n = self.n
+        Z = (self.Tp - n*(n + 1) / 4.0) / self.standard_deviation()
+        pvalue = PValue(Z, n, abs(rejection), min_n=0, **kwargs).pvalue
+        if rejection in (1, -1) and Z * rejection < 0:
+            pvalue = 1.0 - pvalue
+        return pvalue
 
     def get_Zw(self):
         print(self.Zw)
@@ -0,0 +1,195 @@
+""" Single-pass sample moments (count, mean and sum of squared deviations).
+
+Data is read once, in chunks. Each chunk is reduced with NumPy and merged
+into the running totals with the parallel form of Welford's algorithm, so
+arrays, memory-mapped files and generators can all be summarized without
+holding them in memory twice.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    B.P. Welford, "Note on a Method for Calculating Corrected Sums of
+    Squares and Products", 1962
+
+    T.F. Chan, G.H. Golub, R.J. LeVeque, "Updating Formulae and a Pairwise
+    Algorithm for Computing Sample Variances", 1979
+
+"""
+
+from itertools import zip_longest
+
+import numpy as np
+
+# Number of values reduced at a time. 512 kB of floats stays in cache
+# between computing a chunk's mean and its squared deviations.
+CHUNK_SIZE = 2**16
+
+
+class RunningMoments(object):
+    """ Running count, mean and M2 (sum of squared deviations from the
+    mean) of a stream of values.
+    """
+    __slots__ = ('n', 'mean', 'M2')
+
+    def __init__(self, n=0, mean=0.0, M2=0.0):
+        """
+        Parameters
+        ----------
+        n : int
+            Number of values.
+        mean : float
+            Their mean.
+        M2 : float
+            Their sum of squared deviations from the mean.
+        """
+        self.n = n
+        self.mean = mean
+        self.M2 = M2
+
+    @classmethod
+    def from_data(cls, data, chunk_size=CHUNK_SIZE):
+        """ Moments of `data` in one pass.
+
+        Parameters
+        ----------
+        data : array, iterable of floats, or iterable of arrays
+            The values. Arrays are read `chunk_size` values at a time;
+            single values from an iterable are buffered into chunks.
+        chunk_size : int
+            Number of values reduced at a time.
+
+        Returns
+        -------
+        moments : RunningMoments
+        """
+        moments = cls()
+        for chunk in iter_chunks(data, chunk_size):
+            moments.update(chunk)
+        return moments
+
+    def update(self, values):
+        """ Add a chunk of values.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        n = values.size
+        if n == 0:
+            return self
+        mean = values.mean()
+        M2 = np.square(values - mean).sum()
+        return self.merge(RunningMoments(n, mean, M2))
+
+    def merge(self, other):
+        """ Combine with the moments of another set of values, in place.
+        """
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.n / float(n)
+        self.M2 = self.M2 + other.M2 + delta**2 * self.n * other.n / float(n)
+        self.n = n
+        return self
+
+    def variance(self, ddof=1):
+        """ Variance, with `n - ddof` in the denominator.
+        """
+        return self.M2 / float(self.n - ddof)
+
+    def stddev(self, ddof=1):
+        """ Standard deviation, with `n - ddof` in the denominator.
+        """
+        return np.sqrt(self.variance(ddof))
+
+
+def fused_moments(samples, chunk_size=CHUNK_SIZE):
+    """ Moments of several samples in one pass, reading a chunk of each
+    in turn. Generators (e.g., columns of the same file) are advanced
+    together.
+
+    Parameters
+    ----------
+    samples : list
+        Each an array, iterable of floats, or iterable of arrays.
+    chunk_size : int
+        Number of values reduced at a time.
+
+    Returns
+    -------
+    moments : list of RunningMoments
+    """
+    moments = [RunningMoments() for sample in samples]
+    streams = [iter_chunks(sample, chunk_size) for sample in samples]
+    for chunks in zip_longest(*streams):
+        for running, chunk in zip(moments, chunks):
+            if chunk is not None:
+                running.update(chunk)
+    return moments
+
+def group_moments(values, groups, ngroups=None):
+    """ Count, mean and M2 of each group, with `np.bincount` reductions.
+
+    Parameters
+    ----------
+    values : array
+        The values.
+    groups : array of int
+        Group code (0, 1, ...) of each value.
+    ngroups : int
+        Number of groups. By default, one more than the largest code.
+
+    Returns
+    -------
+    n, mean, M2 : arrays
+        One entry per group. Empty groups have a NaN mean.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    groups = np.asarray(groups).ravel()
+    if ngroups is None:
+        ngroups = int(groups.max()) + 1 if groups.size else 0
+    n = np.bincount(groups, minlength=ngroups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(groups, weights=values, minlength=ngroups) / n
+    # Deviations from each group's own mean, as in the two-pass formula.
+    M2 = np.bincount(groups, weights=np.square(values - mean[groups]),
+                     minlength=ngroups)
+    return n, mean, M2
+
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """ Yield `data` as flat float arrays of at most `chunk_size` values
+    (chunks given by the caller are passed through whole).
+
+    Parameters
+    ----------
+    data : array, iterable of floats, or iterable of arrays
+        The values.
+    chunk_size : int
+        Number of values per chunk.
+    """
+    if isinstance(data, np.ndarray):
+        data = data.reshape(-1)
+        for start in range(0, data.size, chunk_size):
+            yield np.asarray(data[start:start + chunk_size], dtype=float)
+        return
+
+    buffer = []
+    for item in data:
+        if np.ndim(item) == 0:
+            buffer.append(item)
+            if len(buffer) == chunk_size:
+                yield np.array(buffer, dtype=float)
+                buffer = []
+        else:
+            if buffer:
+                yield np.array(buffer, dtype=float)
+                buffer = []
+            for chunk in iter_chunks(np.asarray(item), chunk_size):
+                yield chunk
+    if buffer:
+        yield np.array(buffer, dtype=float)
@@ -0,0 +1,290 @@
+""" Multiple-testing corrections of p-values.
+
+Running one test per region (or segment) makes some rejections likely by
+chance alone. Bonferroni and Holm control the family-wise error rate;
+Benjamini-Hochberg controls the false discovery rate.
+
+The in-memory functions take an array of p-values and sort it once.
+`ChunkedCorrection` handles p-values too large for memory, read in
+chunks: it finds the rejection threshold in two passes over the chunks,
+so the p-values are never sorted as a whole.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    Y. Benjamini and Y. Hochberg, "Controlling the False Discovery Rate:
+    A Practical and Powerful Approach to Multiple Testing", 1995
+
+    S. Holm, "A Simple Sequentially Rejective Multiple Test Procedure",
+    1979
+
+"""
+
+import numpy as np
+
+METHODS = ('bonferroni', 'holm', 'fdr_bh')
+
+
+def bonferroni(pvalues, alpha=0.05):
+    """ Bonferroni correction, p * m.
+
+    Parameters
+    ----------
+    pvalues : array
+        The p-values of m tests.
+    alpha : float
+        Family-wise error rate.
+
+    Returns
+    -------
+    adjusted : array
+        Adjusted p-values, capped at 1.
+    reject : array of bool
+        Which null hypotheses are rejected.
+    """
+    pvalues = np.asarray(pvalues, dtype=float)
+    adjusted = np.minimum(pvalues * pvalues.size, 1.0)
+    return adjusted, adjusted <= alpha
+
+def holm(pvalues, alpha=0.05):
+    """ Holm's step-down correction. The i-th smallest p-value is
+    multiplied by m - i + 1, and the adjusted p-values are made to
+    increase with rank.
+
+    Parameters
+    ----------
+    pvalues : array
+        The p-values of m tests.
+    alpha : float
+        Family-wise error rate.
+
+    Returns
+    -------
+    adjusted : array
+        Adjusted p-values, capped at 1.
+    reject : array of bool
+        Which null hypotheses are rejected.
+    """
+    pvalues = np.asarray(pvalues, dtype=float)
+    m = pvalues.size
+    order = np.argsort(pvalues, axis=None)
+    ranked = pvalues.ravel()[order] * np.arange(m, 0, -1)
+    ranked = np.minimum(np.maximum.accumulate(ranked), 1.0)
+    return _unsort(ranked, order, pvalues.shape, alpha)
+
+def benjamini_hochberg(pvalues, alpha=0.05):
+    """ Benjamini-Hochberg step-up correction. The i-th smallest p-value
+    is multiplied by m / i, and the adjusted p-values are made to
+    increase with rank.
+
+    Parameters
+    ----------
+    pvalues : array
+        The p-values of m tests.
+    alpha : float
+        False discovery rate.
+
+    Returns
+    -------
+    adjusted : array
+        Adjusted p-values, capped at 1.
+    reject : array of bool
+        Which null hypotheses are rejected.
+    """
+    pvalues = np.asarray(pvalues, dtype=float)
+    m = pvalues.size
+    order = np.argsort(pvalues, axis=None)
+    ranked = pvalues.ravel()[order] * (float(m) / np.arange(1, m + 1))
+    ranked = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return _unsort(ranked, order, pvalues.shape, alpha)
+
+def correct(pvalues, method='fdr_bh', alpha=0.05):
+    """ Adjust p-values with one of `METHODS`.
+    """
+    if method == 'bonferroni':
+        return bonferroni(pvalues, alpha)
+    elif method == 'holm':
+        return holm(pvalues, alpha)
+    elif method == 'fdr_bh':
+        return benjamini_hochberg(pvalues, alpha)
+    raise ValueError("method must be one of {}, not '{}'".format(METHODS, method))
+
+def _unsort(ranked, order, shape, alpha):
+    adjusted = np.empty(ranked.size)
+    adjusted[order] = ranked
+    adjusted = adjusted.reshape(shape)
+    return adjusted, adjusted <= alpha
+
+
+class ChunkedCorrection(object):
+    """ A multiple-testing correction over p-values read in chunks.
+
+    Every method rejects exactly the p-values at or below a threshold,
+    found without sorting:
+
+    1. One pass counts the p-values (m) and bins them on a logarithmic
+       grid. The bin counts give the rank of every bin edge, which is
+       enough to rule out most bins, and often to place the threshold.
+    2. If the threshold lies within a bin, a second pass collects only
+       the p-values in the bins that are still undecided, and the
+       threshold is found exactly among them.
+
+    Adjusted p-values of Holm and Benjamini-Hochberg depend on the order
+    of all the p-values, so only the rejections are streamed.
+    """
+    def __init__(self, chunks, method='fdr_bh', alpha=0.05, bins=4096):
+        """
+        Parameters
+        ----------
+        chunks : iterable of arrays, or function
+            The p-values. Must be re-iterable (e.g., a list of memory-mapped
+            arrays), or a function returning a fresh iterator on each call.
+        method : {'bonferroni', 'holm', 'fdr_bh'}
+            The correction.
+        alpha : float
+            Family-wise error rate, or false discovery rate for 'fdr_bh'.
+        bins : int
+            Number of logarithmic bins between 1e-30 and 1.
+        """
+        if method not in METHODS:
+            raise ValueError("method must be one of {}, not '{}'".format(
+                METHODS, method))
+        if not callable(chunks) and iter(chunks) is chunks:
+            raise ValueError("chunks must be re-iterable, not a one-shot iterator")
+        self.chunks = chunks
+        self.method = method
+        self.alpha = alpha
+        self.edges = np.concatenate([[0.0], np.logspace(-30, 0, bins)])
+        self.m = None
+        self.n_rejected = None
+        self.threshold = self.find_threshold()
+
+    def iter_chunks(self):
+        """ A fresh pass over the p-values, one flat array per chunk.
+        """
+        chunks = self.chunks() if callable(self.chunks) else self.chunks
+        for chunk in chunks:
+            yield np.asarray(chunk, dtype=float).ravel()
+
+    def histogram(self):
+        """ First pass. The number of p-values at or below each bin edge.
+        """
+        counts = np.zeros(len(self.edges), dtype=np.int64)
+        for chunk in self.iter_chunks():
+            # Bin i holds edges[i-1] < p <= edges[i]; bin 0 holds p = 0.
+            idx = np.searchsorted(self.edges, chunk, side='left')
+            counts += np.bincount(idx, minlength=len(self.edges))
+        return np.cumsum(counts)
+
+    def collect(self, lo, hi):
+        """ Second pass. The sorted p-values in (lo, hi].
+        """
+        parts = [chunk[(chunk > lo) & (chunk <= hi)] for chunk in self.iter_chunks()]
+        return np.sort(np.concatenate(parts))
+
+    def find_threshold(self):
+        """ The threshold at or below which p-values are rejected.
+
+        Returns
+        -------
+        threshold : float
+        """
+        ranks = self.histogram()
+        m = self.m = int(ranks[-1])
+        if m == 0:
+            raise ValueError("no p-values to correct")
+        alpha = self.alpha
+
+        if self.method == 'bonferroni':
+            threshold = alpha / m
+            self.n_rejected = int(sum(np.count_nonzero(chunk <= threshold)
+                                      for chunk in self.iter_chunks()))
+        elif self.method == 'holm':
+            # Reject the ranks below the first p_(i) > alpha / (m - i + 1).
+            first = self._first_holm_failure(ranks)
+            threshold = alpha / (m - first + 2)
+            self.n_rejected = first - 1
+        else:
+            # Reject the ranks up to the last p_(i) <= alpha * i / m.
+            last = self._last_bh_success(ranks)
+            threshold = alpha * last / float(m)
+            self.n_rejected = last
+        return threshold
+
+    def _last_bh_success(self, ranks):
+        m, alpha, edges = self.m, self.alpha, self.edges
+        # Scan bins from the top. A bin holds ranks (ranks[b-1], ranks[b]].
+        undecided = []
+        last = 0
+        for b in range(len(edges) - 1, -1, -1):
+            lo_rank = ranks[b - 1] if b > 0 else 0
+            if ranks[b] == lo_rank:
+                continue
+            lo_edge = edges[b - 1] if b > 0 else 0.0
+            # Every p-value in the bin passes: its largest rank is the answer.
+            if edges[b] <= alpha * (lo_rank + 1) / m:
+                last = ranks[b]
+                break
+            # Its smallest p-value may pass at its largest rank.
+            if lo_edge < alpha * ranks[b] / m:
+                undecided.append(b)
+
+        if undecided:
+            lo = undecided[-1]
+            values = self.collect(self.edges[lo - 1] if lo > 0 else -1.0,
+                                  self.edges[undecided[0]])
+            rank = (ranks[lo - 1] if lo > 0 else 0) + np.arange(1, values.size + 1)
+            passed = rank[values <= alpha * rank / m]
+            if passed.size:
+                last = max(last, passed.max())
+        return int(last)
+
+    def _first_holm_failure(self, ranks):
+        m, alpha, edges = self.m, self.alpha, self.edges
+        # Scan bins from the bottom.
+        undecided = []
+        first = m + 1
+        for b in range(len(edges)):
+            lo_rank = ranks[b - 1] if b > 0 else 0
+            if ranks[b] == lo_rank:
+                continue
+            lo_edge = edges[b - 1] if b > 0 else 0.0
+            # Every p-value in the bin fails: its smallest rank is the answer.
+            if lo_edge >= alpha / (m - ranks[b] + 1):
+                first = lo_rank + 1
+                break
+            # Its largest p-value may fail at its smallest rank.
+            if edges[b] > alpha / (m - lo_rank):
+                undecided.append(b)
+
+        if undecided:
+            lo = undecided[0]
+            values = self.collect(self.edges[lo - 1] if lo > 0 else -1.0,
+                                  self.edges[undecided[-1]])
+            rank = (ranks[lo - 1] if lo > 0 else 0) + np.arange(1, values.size + 1)
+            failed = rank[values > alpha / (m - rank + 1)]
+            if failed.size:
+                first = min(first, failed.min())
+        return int(first)
+
+    def reject(self):
+        """ Rejection masks, one per chunk (another pass).
+        """
+        for chunk in self.iter_chunks():
+            yield chunk <= self.threshold
+
+    def adjust(self):
+        """ Bonferroni-adjusted p-values, one array per chunk. Other methods
+        need every p-value in order, so use the in-memory functions.
+        """
+        if self.method != 'bonferroni':
+            raise ValueError("only 'bonferroni' p-values can be adjusted in chunks")
+        for chunk in self.iter_chunks():
+            yield np.minimum(chunk * self.m, 1.0)
@@ -15,6 +15,7 @@ References:
 """
 
 import numpy as np
+from stats.inferential_stats.pvalue import PValue
 
 class ANOVA(object):
     """ Compares three or more independent random sample means for
@@ -77,6 +78,8 @@ class ANOVA(object):
         self.k = len(means)
         self.N = sum(ns)
         self.F = None
+        self.dfn = self.k - 1
+        self.dfd = self.N - self.k
         self.SS_B = self.between_group_sum_of_squares()
         self.SS_W = self.within_group_sum_of_squares()
         self.MS_B = self.between_group_mean_squares()
@@ -103,11 +106,28 @@ class ANOVA(object):
         return MS_W
 
     def test_statistic(self):
-        self.F = self.MS_W / self.MS_B
+        self.F = self.MS_B / self.MS_W
 
     def get_F(self):
         print(self.F)
 
+    def pvalue(self, backend='table', interpolate=False):
+        """ The p-value of F, with k - 1 and N - k degrees of freedom.
+
+        Parameters
+        ----------
+        backend : {'table', 'analytic'}
+            Look up the nearest F table entry, or compute the exact value.
+        interpolate : {True, False}
+            Interpolate between table entries.
+
+        Returns
+        -------
+        pvalue : float
+        """
+        return PValue(self.F, self.N, f_test=True, k=self.k, backend=backend,
+            interpolate=interpolate).pvalue
+
 
 class KruskalWallis(object):
     """ Compares three or more independent random sample mean ranks
@@ -18,7 +18,9 @@ References:
 from __future__ import print_function
 
 import numpy as np
-from pvalue import PValue
+from stats.inferential_stats.moments import CHUNK_SIZE, RunningMoments, group_moments
+from stats.inferential_stats.pvalue import PValue, PValueBatch
+from stats.tables import distributions
 
 class OneSampleDifferenceMeans(PValue):
     """ Compares a random sample mean to a popsulation mean for 
@@ -48,10 +50,58 @@ class OneSampleDifferenceMeans(PValue):
         if SampleSize < 30, use t
         if SampleSize >= 30, use Z
     """
-    def __init__(self, hyp_mean, mean, n, stddev, rejection):
-        PValue.__init__(self, hyp_mean, mean, n, stddev, rejection)
+    def __init__(self, hyp_mean, mean, n, stddev, rejection=1, **kwargs):
+        """
+        Parameters
+        ----------
+        hyp_mean : float
+            Hypothesized (population) mean.
+        mean : float
+            Sample mean.
+        n : int
+            Sample size.
+        stddev : float
+            Standard deviation of the sample, with n in the denominator
+            (the t statistic divides by sqrt(n - 1)).
+        rejection : int
+            The rejection region of null-hypothesis (2, 1 or -1).
+        kwargs :
+            Passed on to `PValue`, e.g. `backend`.
+        """
         self.hyp_mean = hyp_mean
         self.mean = mean
+        self.stddev = stddev
+        PValue.__init__(self, self.test_statistic(n), n, rejection, **kwargs)
+
+    @classmethod
+    def from_samples(cls, hyp_mean, samples, rejection=1, chunk_size=CHUNK_SIZE,
+                     **kwargs):
+        """ Test raw data, reading it once.
+
+        Parameters
+        ----------
+        hyp_mean : float
+            Hypothesized (population) mean.
+        samples : array, iterable of floats, or iterable of arrays
+            The sample. Generators of chunks are read one chunk at a time.
+        rejection : int
+            The rejection region of null-hypothesis (2, 1 or -1).
+        chunk_size : int
+            Number of values reduced at a time.
+        """
+        moments = RunningMoments.from_data(samples, chunk_size)
+        return cls(hyp_mean, moments.mean, moments.n, moments.stddev(ddof=0),
+                   rejection, **kwargs)
+
+    def test_statistic(self, n):
+        if n >= 30:
+            # Z
+            test_stat = (self.mean - self.hyp_mean) / (self.stddev / np.sqrt(n))
+        elif n < 30:
+            # t
+            test_stat = (self.mean - self.hyp_mean) / (self.stddev / np.sqrt(n - 1))
+
+        return test_stat
 
 
 class OneSampleDifferenceProportions(PValue):
@@ -80,18 +130,173 @@ class OneSampleDifferenceProportions(PValue):
 
         if SampleSize < 30, use t
         if SampleSize >= 30, use Z
+
+    With `exact=True` the p-value is instead the exact binomial tail of
+    the number of successes, which is much better than t at small n.
     """
-    def __init__(self, hyp_prop, prop, n, stddev, rejection):
-        PValue.__init__(self, hyp_prop, prop, n, stddev, rejection)
+    def __init__(self, hyp_prop, prop, n, stddev=None, rejection=1, exact=False,
+                 **kwargs):
+        """
+        Parameters
+        ----------
+        hyp_prop : float
+            Hypothesized (population) proportion.
+        prop : float
+            Sample proportion.
+        n : int
+            Sample size.
+        stddev : float
+            Unused; the standard error follows from `hyp_prop`.
+        rejection : int
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the sample proportion is larger than hypothesized. If -1,
+            it is smaller.
+        exact : {True, False}
+            Use the exact binomial test for the p-value.
+        kwargs :
+            Passed on to `PValue`, e.g. `backend`.
+        """
         self.hyp_prop = hyp_prop
         self.prop = prop
+        self.exact = exact
+        PValue.__init__(self, self.test_statistic(n), n, rejection, **kwargs)
 
-    def test_statistic(self):
-        if self.n >= 30:
+    @classmethod
+    def from_samples(cls, hyp_prop, samples, rejection=1, chunk_size=CHUNK_SIZE,
+                     **kwargs):
+        """ Test raw binary (0 or 1) data, reading it once.
+        """
+        moments = RunningMoments.from_data(samples, chunk_size)
+        return cls(hyp_prop, moments.mean, moments.n, rejection=rejection,
+                   **kwargs)
+
+    @property
+    def successes(self):
+        return int(round(self.prop * self.n))
+
+    def determine_rejection_area(self):
+        if self.exact:
+            return distributions.binom_pvalue(self.successes, self.n,
+                self.hyp_prop, self.rejection)
+        pvalue = PValue.determine_rejection_area(self)
+        # One-tailed, with the sample proportion on the other side, as in
+        # the exact test.
+        if self.rejection in (1, -1) and (self.prop - self.hyp_prop) * self.rejection < 0:
+            pvalue = 1.0 - pvalue
+        return pvalue
+
+    def test_statistic(self, n):
+        if n >= 30:
             # Z
-            test_stat = (self.hyp_val - self.val) / np.sqrt(self.hyp_val*(1-self.hyp_val)/self.n)
-        elif self.n < 30:
+            test_stat = (self.prop - self.hyp_prop) / np.sqrt(self.hyp_prop*(1-self.hyp_prop)/n)
+        elif n < 30:
             # t
-            test_stat = (self.hyp_val - self.val) / np.sqrt(self.hyp_val*(1-self.hyp_val)/(self.n-1))
+            test_stat = (self.prop - self.hyp_prop) / np.sqrt(self.hyp_prop*(1-self.hyp_prop)/(n-1))
+
+        return test_stat    
+
+
+class GroupedOneSampleDifferenceMeans(object):
+    """ `OneSampleDifferenceMeans` for every group of a keyed column at
+    once. Per-group n, mean and standard deviation come from `bincount`
+    reductions, and the p-values from one `PValueBatch`.
+    """
+    def __init__(self, hyp_mean, values, groups, rejection=1, ngroups=None,
+                 **kwargs):
+        """
+        Parameters
+        ----------
+        hyp_mean : float or array
+            Hypothesized mean, for all groups or for each group.
+        values : array
+            The values.
+        groups : array of int
+            Group code (0, 1, ...) of each value.
+        rejection : int or array
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the group mean is larger than hypothesized. If -1, it is
+            smaller.
+        ngroups : int
+            Number of groups. By default, one more than the largest code.
+        kwargs :
+            Passed on to `PValueBatch`, e.g. `backend`.
+        """
+        self.n, self.mean, M2 = group_moments(values, groups, ngroups)
+        self.hyp_mean = np.asarray(hyp_mean, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.stddev = np.sqrt(M2 / self.n)
+            self.test_stat = self.test_statistic()
+        self.batch = PValueBatch(self.test_stat, self.n, rejection,
+                                 directional=True, **kwargs)
+
+    def test_statistic(self):
+        n = self.n
+        # Z where n >= 30, t otherwise.
+        dof = np.where(n >= 30, n, n - 1)
+        test_stat = (self.mean - self.hyp_mean) / (self.stddev / np.sqrt(dof))
+        # Groups of fewer than two units cannot be tested.
+        return np.where(n > 1, test_stat, np.nan)
+
+    @property
+    def pvalue(self):
+        return self.batch.pvalue
+
+
+class GroupedOneSampleDifferenceProportions(object):
+    """ `OneSampleDifferenceProportions` for every group of a keyed
+    column of binary (0 or 1) values at once.
+    """
+    def __init__(self, hyp_prop, values, groups, rejection=1, ngroups=None,
+                 exact=False, **kwargs):
+        """
+        Parameters
+        ----------
+        hyp_prop : float or array
+            Hypothesized proportion, for all groups or for each group.
+        values : array
+            The binary values.
+        groups : array of int
+            Group code (0, 1, ...) of each value.
+        rejection : int or array
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the group proportion is larger than hypothesized. If -1, it is
+            smaller.
+        ngroups : int
+            Number of groups. By default, one more than the largest code.
+        exact : {True, False}
+            Use the exact binomial test for the p-values.
+        kwargs :
+            Passed on to `PValueBatch`, e.g. `backend`.
+        """
+        groups = np.asarray(groups).ravel()
+        if ngroups is None:
+            ngroups = int(groups.max()) + 1 if groups.size else 0
+        self.n = np.bincount(groups, minlength=ngroups)
+        successes = np.bincount(groups, weights=np.asarray(values, dtype=float).ravel(),
+                                minlength=ngroups)
+        self.successes = np.round(successes).astype(np.int64)
+        self.hyp_prop = np.asarray(hyp_prop, dtype=float)
+        self.rejection = rejection
+        self.exact = exact
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.prop = successes / self.n
+            self.test_stat = self.test_statistic()
+        self.batch = PValueBatch(self.test_stat, self.n, rejection,
+                                 directional=True, **kwargs)
+
+    def test_statistic(self):
+        n = self.n
+        # Z where n >= 30, t otherwise.
+        dof = np.where(n >= 30, n, n - 1)
+        test_stat = (self.prop - self.hyp_prop) / np.sqrt(self.hyp_prop*(1-self.hyp_prop)/dof)
+        # Groups of fewer than two units cannot be tested.
+        return np.where(n > 1, test_stat, np.nan)
 
-        return test_stat    
\ No newline at end of file
+    @property
+    def pvalue(self):
+        if self.exact:
+            pvalue = distributions.binom_pvalue(self.successes, self.n,
+                self.hyp_prop, self.rejection)
+            # Empty groups have no outcome to test.
+            return np.where(self.n > 0, pvalue, np.nan)
+        return self.batch.pvalue
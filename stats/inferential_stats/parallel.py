@@ -0,0 +1,104 @@
+""" Blocks of random draws, run in this process or over a process pool.
+
+Resampling tests split their draws into blocks of at most a given size.
+Every block has its own seed, spawned from one `np.random.SeedSequence`,
+so results do not depend on the number of workers. A block function
+takes the shared state, the block size and the block seed; the state is
+sent to each worker once, when the worker starts.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from itertools import islice
+
+import numpy as np
+
+
+def block_sizes(total, block_size):
+    """ Split `total` draws into blocks of `block_size`, the last one
+    holding the remainder.
+    """
+    sizes = [block_size] * (total // block_size)
+    if total % block_size:
+        sizes.append(total % block_size)
+    return sizes
+
+def spawn_seeds(seed, n):
+    """ `n` independent seeds from an int, None or `np.random.SeedSequence`.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+def map_blocks(function, state, total, block_size, seed=None, workers=None):
+    """ Yield `function(state, size, seed)` for every block, in order.
+
+    Parameters
+    ----------
+    function : function
+        The block function. Must be defined at module level to reach the
+        workers.
+    state : tuple
+        Passed to every call.
+    total : int
+        Number of draws.
+    block_size : int
+        Largest number of draws per block.
+    seed : int or np.random.SeedSequence
+        Seeds the blocks.
+    workers : int
+        Number of processes. By default, blocks run in this process.
+
+    Closing the generator early (e.g., on an early stop) cancels the
+    blocks not yet started.
+    """
+    sizes = block_sizes(total, block_size)
+    blocks = zip(sizes, spawn_seeds(seed, len(sizes)))
+    if workers is None:
+        for size, block_seed in blocks:
+            yield function(state, size, block_seed)
+        return
+
+    args = ((function, size, block_seed) for size, block_seed in blocks)
+    with ProcessPoolExecutor(workers, initializer=_set_worker_state,
+                             initargs=(state,)) as pool:
+        # Cancel the pending blocks before the pool waits on them.
+        with closing(map_ahead(pool, _worker_call, args, 2 * workers)) as results:
+            for result in results:
+                yield result
+
+def map_ahead(pool, function, args, ahead):
+    """ Like `pool.map`, but submits at most `ahead` tasks beyond the
+    one being waited on, and cancels the rest when closed early.
+    """
+    args = iter(args)
+    pending = deque(pool.submit(function, *arg) for arg in islice(args, ahead))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            for arg in islice(args, 1):
+                pending.append(pool.submit(function, *arg))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+_worker_state = None
+
+def _set_worker_state(state):
+    global _worker_state
+    _worker_state = state
+
+def _worker_call(function, size, seed):
+    return function(_worker_state, size, seed)
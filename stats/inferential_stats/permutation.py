@@ -0,0 +1,197 @@
+""" Permutation tests of two-sample differences.
+
+The pooled samples are shuffled many times, and the statistic of each
+shuffle is compared with the observed one. Shuffles are drawn in blocks:
+each block is one 2-D array of permuted indices (one row per shuffle),
+and the statistic is computed on all of its rows at once. Blocks can be
+spread over a process pool. Every block has its own seed, spawned from
+one `np.random.SeedSequence`, so results do not depend on the number of
+workers.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    B. Phipson and G.K. Smyth, "Permutation P-values Should Never Be Zero",
+    2010
+
+    C.J. Clopper and E.S. Pearson, "The Use of Confidence or Fiducial
+    Limits Illustrated in the Case of the Binomial", 1934
+
+"""
+
+from contextlib import closing
+from functools import partial
+
+import numpy as np
+from stats.inferential_stats.parallel import map_blocks
+from stats.inferential_stats.ranks import rank_with_ties, tie_correction
+from stats.inferential_stats.twosample import WilcoxonRankSum, ZTestBatch
+from stats.tables.distributions import betaincinv
+
+# Bytes of permuted indices and values per block, when no block size is
+# given.
+BLOCK_BYTES = 2**25
+
+
+def mean_difference(x1, x2):
+    """ Difference of the means, along the last axis.
+    """
+    return x1.mean(axis=-1) - x2.mean(axis=-1)
+
+def t_statistic(x1, x2):
+    """ `ZTest`'s test statistic (t, or Z for large samples), along the
+    last axis.
+    """
+    return ZTestBatch.from_summary(x1.shape[-1], x2.shape[-1],
+        x1.mean(axis=-1), x2.mean(axis=-1),
+        x1.std(axis=-1, ddof=1), x2.std(axis=-1, ddof=1)).test_stat
+
+def rank_sum_statistic(r1, r2, ties=0):
+    """ `WilcoxonRankSum`'s Zw from the ranks of each sample, along the
+    last axis.
+    """
+    return WilcoxonRankSum(r1.shape[-1], r2.shape[-1], r1.sum(axis=-1),
+                           r2.sum(axis=-1), ties).Zw
+
+STATISTICS = {
+    'mean_difference' : mean_difference,
+    't' : t_statistic,
+    'rank_sum' : rank_sum_statistic,
+}
+
+
+class PermutationTest(object):
+    """ Permutation test of whether two samples come from the same
+    distribution.
+
+    The p-value is (b + 1) / (m + 1), where b of m shuffles give a
+    statistic at least as extreme as the observed one. With `early_stop`
+    the shuffling stops once the Clopper-Pearson interval of b / m lies
+    entirely above or below `alpha`.
+    """
+    def __init__(self, x1, x2, statistic='mean_difference', rejection=2,
+                 n_permutations=10000, block_size=None, alpha=0.05,
+                 confidence=0.99, early_stop=True, workers=None, seed=None):
+        """
+        Parameters
+        ----------
+        x1, x2 : array
+            The two samples.
+        statistic : {'mean_difference', 't', 'rank_sum'} or function
+            The test statistic. 'rank_sum' ranks the pooled samples once
+            and shuffles the ranks. A function takes the two samples as
+            arrays with one shuffle per row, returns one value per row,
+            and must be defined at module level to reach the workers.
+        rejection : int
+            The rejection region of null-hypothesis (2, 1 or -1).
+        n_permutations : int
+            Largest number of shuffles.
+        block_size : int
+            Number of shuffles per block. By default, as many as fit in
+            `BLOCK_BYTES`.
+        alpha : float
+            Significance level at which to stop early.
+        confidence : float
+            Confidence level of the interval of the p-value.
+        early_stop : {True, False}
+            Stop once the interval clears `alpha`.
+        workers : int
+            Number of processes. By default, blocks run in this process.
+        seed : int or np.random.SeedSequence
+            Seeds the shuffles.
+        """
+        x1 = np.asarray(x1, dtype=float).ravel()
+        x2 = np.asarray(x2, dtype=float).ravel()
+        pooled = np.concatenate([x1, x2])
+        if statistic == 'rank_sum':
+            pooled, tie_counts = rank_with_ties(pooled)
+            statistic = partial(rank_sum_statistic, ties=tie_correction(tie_counts))
+        elif not callable(statistic):
+            if statistic not in STATISTICS:
+                raise ValueError("statistic must be one of {} or a function, "
+                                 "not '{}'".format(sorted(STATISTICS), statistic))
+            statistic = STATISTICS[statistic]
+        if rejection not in (2, 1, -1):
+            raise ValueError("rejection must be 2, 1 or -1, not {}".format(rejection))
+
+        self.n1 = x1.size
+        self.n2 = x2.size
+        self.statistic = statistic
+        self.rejection = rejection
+        self.alpha = alpha
+        self.confidence = confidence
+        self.early_stop = early_stop
+        self.workers = workers
+        self.seed = seed
+        if block_size is None:
+            block_size = BLOCK_BYTES // (16 * pooled.size)
+        self.block_size = int(max(1, min(block_size, n_permutations)))
+        self.observed = float(np.asarray(
+            statistic(pooled[None, :self.n1], pooled[None, self.n1:]))[0])
+
+        self.count = 0
+        self.n_permutations = 0
+        self.stopped_early = False
+        self._run(pooled, n_permutations)
+
+    def _run(self, pooled, n_permutations):
+        state = (pooled, self.n1, self.statistic, self.observed, self.rejection)
+        with closing(map_blocks(_count_extreme, state, n_permutations,
+                                self.block_size, self.seed, self.workers)) as counts:
+            self._collect(counts)
+
+    def _collect(self, counts):
+        # Blocks are tallied in order, so stopping is reproducible.
+        for count, size in counts:
+            self.count += count
+            self.n_permutations += size
+            if self.early_stop and self._decided():
+                self.stopped_early = True
+                break
+
+    def _decided(self):
+        lower, upper = self.interval
+        return upper < self.alpha or lower > self.alpha
+
+    @property
+    def pvalue(self):
+        return (self.count + 1.0) / (self.n_permutations + 1.0)
+
+    @property
+    def interval(self):
+        """ Clopper-Pearson interval of the fraction of shuffles at least
+        as extreme as observed, at `confidence`.
+        """
+        b, m = self.count, self.n_permutations
+        tail = (1 - self.confidence) / 2.0
+        lower = betaincinv(b, m - b + 1, tail) if b > 0 else 0.0
+        upper = betaincinv(b + 1, m - b, 1 - tail) if b < m else 1.0
+        return float(lower), float(upper)
+
+
+def _count_extreme(state, size, seed):
+    """ Shuffle the pooled samples `size` times and count the statistics
+    at least as extreme as observed.
+    """
+    pooled, n1, statistic, observed, rejection = state
+    rng = np.random.default_rng(seed)
+    index = np.tile(np.arange(pooled.size), (size, 1))
+    rng.permuted(index, axis=1, out=index)
+    values = pooled[index]
+    stats = np.asarray(statistic(values[:, :n1], values[:, n1:]))
+    # Allow for rounding in statistics equal to the observed one.
+    tolerance = 1e-12 * max(1.0, abs(observed))
+    if rejection == 2:
+        extreme = np.abs(stats) >= abs(observed) - tolerance
+    elif rejection == 1:
+        extreme = stats >= observed - tolerance
+    else:
+        extreme = stats <= observed + tolerance
+    return int(np.count_nonzero(extreme)), size
@@ -18,13 +18,21 @@ References:
 from __future__ import print_function
 
 import numpy as np
-import pandas as pd
-from stats.tables.load_table import LoadNormalTable, LoadStudentsTTable, LoadChi2Table
+from stats.tables.load_table import (LoadNormalTable, LoadStudentsTTable,
+    LoadChi2Table, LoadFTable)
 
 
 class PValue(object):
+    """ The p-value of a test statistic. The table lookup is deferred
+    until `area` or `pvalue` is first read.
+    """
+    __slots__ = ('test_stat', 'n', 'rejection', 'min_n', 'chi_square',
+                 'f_test', 'k', 'df', 'backend', 'interpolate', '_area',
+                 '_pvalue')
 
-    def __init__(self, test_stat, n, rejection=1, chi_square=False, min_n=30):
+    def __init__(self, test_stat, n, rejection=1, chi_square=False, min_n=30,
+                 backend='table', interpolate=False, f_test=False, k=None,
+                 df=None):
         """ 
         If p-value near 1: Trust null hypothesis. ("our data is highly
            consistant with our hypothesis")
@@ -33,9 +41,10 @@ class PValue(object):
         Parameters
         ----------
         test_stat : float
-            The t or Z value from statistics test.
+            The t, Z, Chi-Square or F value from statistics test.
         n : int
-            Sample size.
+            Sample size. For an F test, the total number of observations
+            in all samples.
         rejection : int
             The rejection region of null-hypothesis.
             If 2, two-tailed, equals alpha/2 on each side.
@@ -45,15 +54,51 @@ class PValue(object):
             The minimum n to use normal table. Nominally 30 for most 
             statistics test.
             Wilcoxon Matched-Pairs requires min_n=10.
+        backend : {'table', 'analytic'}
+            Look up the nearest entry of the CSV tables, or compute the
+            exact distribution functions.
+        interpolate : {True, False}
+            Interpolate between table entries rather than use the nearest
+            one. Ignored by the analytic backend.
+        f_test : {True, False}
+            Whether the test statistic is an F (e.g., from ANOVA), with
+            k - 1 and n - k degrees of freedom.
+        k : int
+            Number of samples, for an F test.
+        df : float
+            Degrees of freedom of a t or Chi-Square test, if not n - 1.
+            May be fractional (e.g., Welch's t test).
         """
         self.test_stat = abs(test_stat)
         self.n = n
         self.rejection = rejection
         self.min_n = min_n
         self.chi_square = chi_square
+        self.f_test = f_test
+        self.k = k
+        self.df = n - 1 if df is None else df
+        self.backend = backend
+        self.interpolate = interpolate
 
-        self.area = self.determine_probability_tail()
-        self.pvalue = self.determine_rejection_area()
+        self._area = None
+        self._pvalue = None
+
+    @property
+    def area(self):
+        """ The area under one section of the distribution, looked up on
+        first access.
+        """
+        if self._area is None:
+            self._area = self.determine_probability_tail()
+        return self._area
+
+    @property
+    def pvalue(self):
+        """ The p-value, computed on first access.
+        """
+        if self._pvalue is None:
+            self._pvalue = self.determine_rejection_area()
+        return self._pvalue
 
     def determine_probability_tail(self):
         """ Calculates probability (relative area) under one section of 
@@ -66,17 +111,28 @@ class PValue(object):
         """
         # If test statistic is a Chi-Square,
         if self.chi_square:
-            chi2_table = LoadChi2Table()
-            area = chi2_table.find_confidence(self.test_stat, df=self.n-1)
+            chi2_table = LoadChi2Table(backend=self.backend,
+                interpolate=self.interpolate)
+            area = chi2_table.find_confidence(self.test_stat, df=self.df)
+            return area
+
+        # If test statistic is an F,
+        if self.f_test:
+            f_table = LoadFTable(backend=self.backend,
+                interpolate=self.interpolate)
+            area = f_table.find_confidence(self.test_stat, dfn=self.k-1,
+                dfd=self.n-self.k)
             return area
 
         # Otherwise, need look up on Z or t table what the area should be. 
         if self.n >= self.min_n:
-            z_table = LoadNormalTable()
+            z_table = LoadNormalTable(backend=self.backend,
+                interpolate=self.interpolate)
             area = z_table.find_prob(self.test_stat)
         elif self.n < self.min_n:
-            t_table = LoadStudentsTTable(tails=1)
-            area = t_table.find_confidence(self.test_stat, df=self.n-1)
+            t_table = LoadStudentsTTable(tails=1, backend=self.backend,
+                interpolate=self.interpolate)
+            area = t_table.find_confidence(self.test_stat, df=self.df)
         return area
 
     def determine_rejection_area(self):
@@ -87,16 +143,167 @@ class PValue(object):
         -------
         pvalue : float
         """
-        if self.chi_square:
+        if self.chi_square or self.f_test:
             pvalue = 1.0 - self.area
 
         else:
             pvalue = 0.5 - self.area
             # Double area if two-tailed.
-            pvalue *= self.rejection
+            pvalue *= abs(self.rejection)
 
         return pvalue
 
     def get_pvalue(self):
         print(self.pvalue)
+
+
+class PValueBatch(object):
+    """ Array version of `PValue`, for many tests at once.
+
+    The tests are split with boolean masks into normal, t, Chi-Square
+    and F groups, and each group is resolved with one vectorized table
+    lookup. As with `PValue`, nothing is looked up until `area` or
+    `pvalue` is first read. Test statistics that are not finite (e.g.,
+    from empty groups) get NaN areas and p-values.
+    """
+    __slots__ = ('test_stats', 'ns', 'rejections', 'chi_square', 'min_n',
+                 'f_test', 'k', 'df', 'backend', 'interpolate', 'signs',
+                 '_area', '_pvalue')
+
+    def __init__(self, test_stats, ns, rejections=1, chi_square=False,
+                 min_n=30, backend='table', interpolate=False, f_test=False,
+                 k=None, df=None, directional=False):
+        """
+        Parameters
+        ----------
+        test_stats : array
+            The t, Z, Chi-Square or F values from statistics tests.
+        ns : array
+            Sample sizes.
+        rejections : int or array
+            The rejection region of each null-hypothesis (2, 1 or -1).
+        chi_square : bool or array
+            Which test statistics are Chi-Squares.
+        min_n : int or array
+            The minimum n to use normal table.
+        backend : {'table', 'analytic'}
+            Look up the nearest table entries, or compute the exact
+            distribution functions.
+        interpolate : {True, False}
+            Interpolate between table entries.
+        f_test : bool or array
+            Which test statistics are F values, with k - 1 and n - k
+            degrees of freedom.
+        k : int or array
+            Number of samples, for the F tests.
+        df : float or array
+            Degrees of freedom of the t and Chi-Square tests, if not
+            n - 1 (e.g., n1 + n2 - 2 for a pooled two-sample t).
+        directional : {True, False}
+            Keep the signs of the test statistics, so that a one-tailed
+            test whose statistic lies on the other side has a p-value
+            above 0.5. By default only their magnitudes count, as in
+            `PValue`.
+
+        All array parameters are broadcast against each other.
+        """
+        arrays = np.broadcast_arrays(np.asarray(test_stats, dtype=float),
+            np.asarray(ns), np.asarray(rejections), np.asarray(chi_square, dtype=bool),
+            np.asarray(min_n), np.asarray(f_test, dtype=bool),
+            np.asarray(0 if k is None else k),
+            np.asarray(np.nan if df is None else df, dtype=float))
+        self.test_stats = np.abs(arrays[0])
+        self.signs = np.sign(arrays[0]) if directional else None
+        self.ns, self.rejections, self.chi_square, self.min_n, self.f_test, \
+            self.k = arrays[1:-1]
+        self.df = np.where(np.isnan(arrays[-1]), self.ns - 1, arrays[-1])
+        self.backend = backend
+        self.interpolate = interpolate
+
+        self._area = None
+        self._pvalue = None
+
+    @property
+    def area(self):
+        """ The areas under the distributions, looked up on first access.
+        """
+        if self._area is None:
+            self._area = self.determine_probability_tail()
+        return self._area
+
+    @property
+    def pvalue(self):
+        """ The p-values, computed on first access.
+        """
+        if self._pvalue is None:
+            self._pvalue = self.determine_rejection_area()
+        return self._pvalue
+
+    @property
+    def finite_mask(self):
+        return np.isfinite(self.test_stats)
+
+    @property
+    def normal_mask(self):
+        return ~self.chi_square & ~self.f_test & (self.ns >= self.min_n) & \
+            self.finite_mask
+
+    @property
+    def t_mask(self):
+        return ~self.chi_square & ~self.f_test & (self.ns < self.min_n) & \
+            self.finite_mask
+
+    @property
+    def chi_square_mask(self):
+        return self.chi_square & ~self.f_test & self.finite_mask
+
+    @property
+    def f_mask(self):
+        return self.f_test & self.finite_mask
+
+    def determine_probability_tail(self):
+        """ Calculates the probability (relative area) for each test
+        statistic, one table lookup per group.
+
+        Returns
+        -------
+        area : array
+        """
+        area = np.full(self.test_stats.shape, np.nan)
+        stats, ns = self.test_stats, self.ns
+        options = dict(backend=self.backend, interpolate=self.interpolate)
+
+        mask = self.normal_mask
+        if mask.any():
+            area[mask] = LoadNormalTable(**options).find_prob_array(stats[mask])
+        mask = self.t_mask
+        if mask.any():
+            area[mask] = LoadStudentsTTable(tails=1, **options).find_confidence_array(
+                stats[mask], self.df[mask])
+        mask = self.chi_square_mask
+        if mask.any():
+            area[mask] = LoadChi2Table(**options).find_confidence_array(
+                stats[mask], self.df[mask])
+        mask = self.f_mask
+        if mask.any():
+            k = self.k[mask]
+            area[mask] = LoadFTable(**options).find_confidence_array(
+                stats[mask], k - 1, ns[mask] - k)
+        return area
+
+    def determine_rejection_area(self):
+        """ The p-value (area of tail) of each test.
+
+        Returns
+        -------
+        pvalue : array
+        """
+        upper_tail = self.chi_square | self.f_test
+        pvalue = (0.5 - self.area) * np.abs(self.rejections)
+        if self.signs is not None:
+            # One-tailed, with the statistic on the other side.
+            opposite = self.signs * self.rejections < 0
+            pvalue = np.where(opposite & (np.abs(self.rejections) == 1),
+                              0.5 + self.area, pvalue)
+        return np.where(upper_tail, 1.0 - self.area, pvalue)
     
@@ -0,0 +1,57 @@
+""" Ranking with ties, for the rank tests.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    "Introduction to Statistical Problem Solving in Geography",
+    J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
+
+"""
+
+import numpy as np
+
+
+def rank_with_ties(values):
+    """ Rank values from 1 (smallest), giving tied values the average of
+    the ranks they span. One sort; the rest is vectorized.
+
+    Parameters
+    ----------
+    values : array
+        The values to rank.
+
+    Returns
+    -------
+    ranks : array
+        Rank of each value, in the order given.
+    tie_counts : array of int
+        The size of every group of equal values (1 if untied).
+    """
+    values = np.asarray(values).ravel()
+    order = np.argsort(values, kind='mergesort')
+    ordered = values[order]
+    # Number each run of equal values.
+    new_run = np.empty(ordered.size, dtype=bool)
+    new_run[:1] = True
+    new_run[1:] = ordered[1:] != ordered[:-1]
+    run = np.cumsum(new_run) - 1
+    tie_counts = np.bincount(run)
+    # Runs start after all the values below them; average the ranks spanned.
+    starts = np.cumsum(tie_counts) - tie_counts
+    average = starts + (tie_counts + 1) / 2.0
+    ranks = np.empty(values.size)
+    ranks[order] = average[run]
+    return ranks, tie_counts
+
+def tie_correction(tie_counts):
+    """ sum(t^3 - t) over every group of t tied values.
+    """
+    t = np.asarray(tie_counts, dtype=float)
+    return float(np.sum(t**3 - t))
@@ -16,6 +16,10 @@ References:
 """
 
 import numpy as np
+from stats.inferential_stats.moments import CHUNK_SIZE, fused_moments
+from stats.inferential_stats.pvalue import PValue, PValueBatch
+from stats.inferential_stats.ranks import rank_with_ties, tie_correction
+from stats.tables import exact_rank_tables
 
 class DiffOfMeans(object):
     """ Base class for two-sample difference of means tests.
@@ -88,8 +92,18 @@ class ZTest(DiffOfMeans):
         SVE = StandardErrorOfDifferenceOfMeans 
             = sqrt( (SampleVariance1^2 / NumberSamples1) +
                     (SampleVariance2^2 / NumberSamples2) )
+
+        With `welch=True` the test always uses SVE (unless the population
+        deviations are known), and `df` holds the Welch-Satterthwaite
+        degrees of freedom even where Z is used
+
+        df = (v1 + v2)^2 / ( v1^2 / (NumberSamples1 - 1) +
+                             v2^2 / (NumberSamples2 - 1) )
+
+        where v_i = SampleVariance_i^2 / NumberSamples_i.
     """
-    def __init__(self, n1, n2, mean1, mean2, s1, s2, sigma1=None, sigma2=None):
+    def __init__(self, n1, n2, mean1, mean2, s1, s2, sigma1=None, sigma2=None,
+                 welch=False):
         DiffOfMeans.__init__(self, n1, n2)
         """
         Parameters
@@ -99,13 +113,15 @@ class ZTest(DiffOfMeans):
         mean2 : float
             Mean of sample 2.
         s1 : float
-            Variance of sample 1.
+            Standard deviation of sample 1.
         s2 : float
-            Variance of sample 2.
+            Standard deviation of sample 2.
         sigma1 : float
-            Variance of population 1, if known.
+            Standard deviation of population 1, if known.
         sigma2 : float
-            Variance of population 2, if known.
+            Standard deviation of population 2, if known.
+        welch : {True, False}
+            Use Welch's t test, which does not assume equal variances.
         """
         self.mean1 = mean1
         self.mean2 = mean2
@@ -113,12 +129,37 @@ class ZTest(DiffOfMeans):
         self.s2 = s2
         self.sigma1 = sigma1
         self.sigma2 = sigma2
+        self.welch = welch
         self.Z = None
         self.t = None
+        self.df = None
         self.sigma_x1subx2 = None
         self.test_stat = None
         self.test_statistic()
-    
+
+    @classmethod
+    def from_samples(cls, x1, x2, sigma1=None, sigma2=None, welch=False,
+                     chunk_size=CHUNK_SIZE):
+        """ Test raw data. The size, mean and standard deviation of both
+        samples are accumulated in a single pass.
+
+        Parameters
+        ----------
+        x1, x2 : array, iterable of floats, or iterable of arrays
+            The samples. Generators of chunks are read one chunk at a time.
+        sigma1 : float
+            Standard deviation of population 1, if known.
+        sigma2 : float
+            Standard deviation of population 2, if known.
+        welch : {True, False}
+            Use Welch's t test.
+        chunk_size : int
+            Number of values reduced at a time.
+        """
+        m1, m2 = fused_moments([x1, x2], chunk_size)
+        return cls(m1.n, m2.n, m1.mean, m2.mean, m1.stddev(), m2.stddev(),
+                   sigma1, sigma2, welch)
+
     def standard_error(self, var1, var2):
         """ Calculates standard error of difference of means.
         """
@@ -126,7 +167,7 @@ class ZTest(DiffOfMeans):
             sigma_x1subx2 = np.sqrt( (var1**2 / self.n1) + (var2**2 / self.n2) )
 
         elif var1 == var2:
-            PVE = np.sqrt( (var1**2 * (self.n1 - 1) + var2**2 * (n2 - 1)) / \
+            PVE = np.sqrt( (var1**2 * (self.n1 - 1) + var2**2 * (self.n2 - 1)) / \
                             (self.n1 + self.n2 - 2) )
             sigma_x1subx2 = PVE * np.sqrt( (1 / self.n1) + (1 / self.n2) )
 
@@ -147,18 +188,184 @@ class ZTest(DiffOfMeans):
             self.test_stat = self.Z
 
         elif (self.sigma1 != None or self.sigma2 != None) or (self.n1 < 30 or self.n2 < 30):
-            sigma_x1subx2 = self.standard_error(self.s1, self.s2)
+            if self.welch:
+                sigma_x1subx2 = np.sqrt( (self.s1**2 / self.n1) + (self.s2**2 / self.n2) )
+                self.df = welch_satterthwaite(self.s1, self.s2, self.n1, self.n2)
+            else:
+                sigma_x1subx2 = self.standard_error(self.s1, self.s2)
+                self.df = t_degrees_of_freedom(self.s1, self.s2, self.n1, self.n2)
             self.t = (self.mean1 - self.mean2) / sigma_x1subx2
             self.test_stat = self.t
 
+        else:
+            # Large samples: the sample standard deviations stand in for
+            # the unknown population ones.
+            if self.welch:
+                sigma_x1subx2 = np.sqrt( (self.s1**2 / self.n1) + (self.s2**2 / self.n2) )
+            else:
+                sigma_x1subx2 = self.standard_error(self.s1, self.s2)
+            self.Z = (self.mean1 - self.mean2) / sigma_x1subx2
+            self.test_stat = self.Z
+
+        if self.welch:
+            # Reported even where Z is used for the p-value.
+            self.df = welch_satterthwaite(self.s1, self.s2, self.n1, self.n2)
         self.sigma_x1subx2 = sigma_x1subx2
 
+    def pvalue(self, rejection=2, **kwargs):
+        """ The p-value of the test statistic, with `self.df` degrees of
+        freedom for t.
+
+        Parameters
+        ----------
+        rejection : int
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the first mean is larger. If -1, it is smaller.
+        kwargs :
+            Passed on to `PValue`, e.g. `backend` or `interpolate`, which
+            make use of fractional Welch degrees of freedom.
+        """
+        pvalue = PValue(self.test_stat, min(self.n1, self.n2), abs(rejection),
+                        df=self.df, **kwargs).pvalue
+        if rejection in (1, -1) and self.test_stat * rejection < 0:
+            pvalue = 1.0 - pvalue
+        return pvalue
+
     def get_Z(self):
         print(self.Z)
 
     def get_t(self):
         print(self.t)
 
+class ZTestBatch(object):
+    """ `ZTest` on many metrics at once. Each group is a 2-D array with
+    one row per unit and one column per metric; means and standard
+    deviations are reduced along the rows, and the test statistics and
+    p-values come back as one entry per metric.
+
+    As in `ZTest`, Z is used when both samples have at least 30 units,
+    with the population standard deviations if known. Otherwise t is used,
+    pooled (n1 + n2 - 2 degrees of freedom) where the sample standard
+    deviations are equal and with min(n1, n2) - 1 degrees of freedom
+    where they are not, or as Welch's t test with `welch=True`. Test
+    statistics keep their sign, and so do one-tailed p-values: under
+    rejection 1 a metric whose first mean is smaller gets a p-value above
+    0.5.
+    """
+    def __init__(self, x1, x2, sigma1=None, sigma2=None, rejection=2,
+                 welch=False, **kwargs):
+        """
+        Parameters
+        ----------
+        x1, x2 : 2-D arrays
+            Units by metrics, for each group.
+        sigma1, sigma2 : float or array
+            Standard deviations of the populations, if known (both or
+            neither).
+        rejection : int or array
+            The rejection region of null-hypothesis (2, 1 or -1).
+        welch : {True, False}
+            Use Welch's t test, with Welch-Satterthwaite degrees of freedom.
+        kwargs :
+            Passed on to `PValueBatch`, e.g. `backend`.
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        self._test(x1.shape[0], x2.shape[0], x1.mean(axis=0), x2.mean(axis=0),
+                   x1.std(axis=0, ddof=1), x2.std(axis=0, ddof=1), sigma1,
+                   sigma2, rejection, welch, kwargs)
+
+    @classmethod
+    def from_summary(cls, n1, n2, mean1, mean2, s1, s2, sigma1=None, sigma2=None,
+                     rejection=2, welch=False, **kwargs):
+        """ Test arrays of summary statistics, one entry per test.
+
+        Parameters
+        ----------
+        n1, n2 : int or array
+            Sample sizes.
+        mean1, mean2 : float or array
+            Sample means.
+        s1, s2 : float or array
+            Sample standard deviations.
+
+        The other parameters are as for `ZTestBatch`.
+        """
+        batch = cls.__new__(cls)
+        batch._test(n1, n2, mean1, mean2, s1, s2, sigma1, sigma2, rejection,
+                    welch, kwargs)
+        return batch
+
+    def _test(self, n1, n2, mean1, mean2, s1, s2, sigma1, sigma2, rejection,
+              welch, kwargs):
+        if (sigma1 is None) != (sigma2 is None):
+            raise ValueError("give both sigma1 and sigma2, or neither")
+        self.n1 = np.asarray(n1, dtype=float)
+        self.n2 = np.asarray(n2, dtype=float)
+        self.mean1 = np.asarray(mean1, dtype=float)
+        self.mean2 = np.asarray(mean2, dtype=float)
+        self.s1 = np.asarray(s1, dtype=float)
+        self.s2 = np.asarray(s2, dtype=float)
+        self.sigma1 = sigma1
+        self.sigma2 = sigma2
+        self.welch = welch
+        self.large = (self.n1 >= 30) & (self.n2 >= 30)
+        self.sigma_x1subx2, self.df = self.standard_error()
+        self.test_stat = (self.mean1 - self.mean2) / self.sigma_x1subx2
+        self.batch = PValueBatch(self.test_stat, np.minimum(self.n1, self.n2),
+                                 rejection, df=self.df, directional=True,
+                                 **kwargs)
+
+    def standard_error(self):
+        """ Standard errors of the difference of means, and the degrees of
+        freedom of the t tests (NaN for Z, except Welch-Satterthwaite
+        df, which are always given with `welch=True`).
+        """
+        n1, n2 = self.n1, self.n2
+        var1, var2 = np.square(self.s1), np.square(self.s2)
+        SVE = np.sqrt(var1 / n1 + var2 / n2)
+
+        # Z, with the population standard deviations if known.
+        if self.sigma1 is not None:
+            Z_error = np.sqrt(np.square(self.sigma1) / n1 + np.square(self.sigma2) / n2)
+        else:
+            Z_error = SVE
+
+        # t, pooled or not.
+        if self.welch:
+            t_error = SVE
+            df = welch_satterthwaite(self.s1, self.s2, n1, n2)
+        else:
+            PVE = np.sqrt((var1 * (n1 - 1) + var2 * (n2 - 1)) / (n1 + n2 - 2))
+            t_error = np.where(self.s1 == self.s2, PVE * np.sqrt(1 / n1 + 1 / n2), SVE)
+            df = t_degrees_of_freedom(self.s1, self.s2, n1, n2)
+
+        if not self.welch:
+            df = np.where(self.large, np.nan, df)
+        return np.where(self.large, Z_error, t_error), df
+
+    @property
+    def pvalue(self):
+        return self.batch.pvalue
+
+
+def welch_satterthwaite(s1, s2, n1, n2):
+    """ Welch-Satterthwaite degrees of freedom of the difference of two
+    means, from the sample standard deviations and sizes. Fractional;
+    works on arrays.
+    """
+    v1 = np.square(s1) / n1
+    v2 = np.square(s2) / n2
+    return np.square(v1 + v2) / (np.square(v1) / (n1 - 1) + np.square(v2) / (n2 - 1))
+
+def t_degrees_of_freedom(s1, s2, n1, n2):
+    """ Degrees of freedom of the two-sample t test: n1 + n2 - 2 if
+    pooled (equal standard deviations), else the conservative
+    min(n1, n2) - 1.
+    """
+    return np.where(np.asarray(s1) == s2, np.add(n1, n2) - 2, np.minimum(n1, n2) - 1)
+
+
 class WilcoxonRankSum(DiffOfMeans):
     """ Compares two independent random sample rank sums for difference
     using Wilcoxon rank sum "W" test.
@@ -192,8 +399,15 @@ class WilcoxonRankSum(DiffOfMeans):
 
         "W" is the Zw of the group with the *smaller* sample size.
 
+        With ties, the variance is reduced by
+
+            SampleSize1 * SampleSize2 * sum(T) / (12 * N * (N - 1))
+
+        where N = SampleSize1 + SampleSize2 and T = t^3 - t for each
+        group of t tied observations.
+
     """
-    def __init__(self, n1, n2, W1, W2):
+    def __init__(self, n1, n2, W1, W2, ties=0):
         DiffOfMeans.__init__(self, n1, n2)
         """
         Parameters
@@ -202,16 +416,40 @@ class WilcoxonRankSum(DiffOfMeans):
             The sum of ranks for sample 1.
         W2 : float
             The sum of ranks for sample 2.
+        ties : float
+            sum(t^3 - t) over the groups of tied observations.
         """
         self.W1 = W1
         self.W2 = W2
+        self.ties = ties
         self.Zw = None
         self.s_w = self.standard_deviation()
         self.test_statistic()
         self.test_stat = self.Zw
 
+    @classmethod
+    def from_samples(cls, x1, x2):
+        """ Rank the pooled samples (average ranks for ties) and test.
+
+        Parameters
+        ----------
+        x1, x2 : array
+            The two samples.
+        """
+        x1 = np.asarray(x1).ravel()
+        x2 = np.asarray(x2).ravel()
+        ranks, tie_counts = rank_with_ties(np.concatenate([x1, x2]))
+        W1 = ranks[:x1.size].sum()
+        W2 = ranks[x1.size:].sum()
+        return cls(x1.size, x2.size, W1, W2, tie_correction(tie_counts))
+
     def standard_deviation(self):
-        s_w = np.sqrt( self.n1 * self.n2 * (self.n1 + self.n2 + 1) / 12.0 )
+        n1, n2 = self.n1, self.n2
+        N = n1 + n2
+        variance = n1 * n2 * (N + 1) / 12.0
+        if self.ties:
+            variance -= n1 * n2 * self.ties / (12.0 * N * (N - 1))
+        s_w = np.sqrt(variance)
         return s_w
     
     def mean_rank_W(self, n):
@@ -225,6 +463,34 @@ class WilcoxonRankSum(DiffOfMeans):
         else:
             self.Zw = (self.W2 - self.mean_rank_W(self.n2)) / self.s_w
 
+    def pvalue(self, rejection=2, exact=False, **kwargs):
+        """ The p-value of W, the rank sum of the smaller sample.
+
+        Parameters
+        ----------
+        rejection : int
+            The rejection region of null-hypothesis. If 2, two-tailed. If
+            1, the smaller sample ranks higher (large W). If -1, it ranks
+            lower.
+        exact : {True, False}
+            Use the exact null distribution of W (which assumes no ties)
+            instead of the normal approximation. Limited to samples of
+            `exact_rank_tables.RANK_SUM_MAX_N`.
+        kwargs :
+            Passed on to `PValue`, e.g. `backend`.
+        """
+        if exact:
+            if self.n1 < self.n2:
+                W, n, n_other = self.W1, self.n1, self.n2
+            else:
+                W, n, n_other = self.W2, self.n2, self.n1
+            return exact_rank_tables.rank_sum_pvalue(W, n, n_other, rejection)
+        pvalue = PValue(self.Zw, self.n1 + self.n2, abs(rejection), min_n=0,
+                        **kwargs).pvalue
+        if rejection in (1, -1) and self.Zw * rejection < 0:
+            pvalue = 1.0 - pvalue
+        return pvalue
+
     def get_Zw(self):
         print(self.Zw)
 
@@ -296,3 +562,82 @@ class DiffOfProportions():
     def get_Zp(self):
         print(self.Zp) 
 
+
+class DiffOfProportionsBatch(object):
+    """ `DiffOfProportions` on many binary metrics at once. Each group is
+    a 2-D array of 0s and 1s with one row per unit and one column per
+    metric; `from_counts` takes success and trial counts instead (e.g.,
+    one entry per pair of segments).
+
+    Test statistics keep their sign (p1 > p2 is positive), and one-tailed
+    p-values follow it: with `rejection=1`, p1 < p2 gives a p-value above
+    0.5. Where both groups are all successes or all failures, there is no
+    difference, and Z is 0. Where either group is empty, Z and the
+    p-value are NaN.
+    """
+    def __init__(self, x1, x2, rejection=2, **kwargs):
+        """
+        Parameters
+        ----------
+        x1, x2 : 2-D arrays
+            Units by metrics, for each group.
+        rejection : int or array
+            The rejection region of null-hypothesis (2, 1 or -1).
+        kwargs :
+            Passed on to `PValueBatch`, e.g. `backend`.
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        self._test(x1.shape[0], x2.shape[0], x1.mean(axis=0), x2.mean(axis=0),
+                   rejection, kwargs)
+
+    @classmethod
+    def from_counts(cls, successes1, trials1, successes2, trials2, rejection=2,
+                    **kwargs):
+        """ Test arrays of counts, one entry per test.
+
+        Parameters
+        ----------
+        successes1, successes2 : int or array
+            Number of units in the category of focus, in each group.
+        trials1, trials2 : int or array
+            Size of each group.
+
+        The other parameters are as for `DiffOfProportionsBatch`.
+        """
+        trials1 = np.asarray(trials1, dtype=float)
+        trials2 = np.asarray(trials2, dtype=float)
+        batch = cls.__new__(cls)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p1 = successes1 / trials1
+            p2 = successes2 / trials2
+        batch._test(trials1, trials2, p1, p2, rejection, kwargs)
+        return batch
+
+    def _test(self, n1, n2, p1, p2, rejection, kwargs):
+        self.n1 = np.asarray(n1, dtype=float)
+        self.n2 = np.asarray(n2, dtype=float)
+        self.p1 = np.asarray(p1, dtype=float)
+        self.p2 = np.asarray(p2, dtype=float)
+        self.pooled_estimate = None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.sigma_p1subp2 = self.standard_error()
+            Zp = np.where(self.sigma_p1subp2 > 0,
+                          (self.p1 - self.p2) / self.sigma_p1subp2, 0.0)
+        self.Zp = np.where((self.n1 > 0) & (self.n2 > 0), Zp, np.nan)
+        self.test_stat = self.Zp
+        # Always the normal distribution.
+        self.batch = PValueBatch(self.Zp, self.n1 + self.n2, rejection, min_n=0,
+                                 directional=True, **kwargs)
+
+    def standard_error(self):
+        """ Standard errors of the difference of proportions.
+        """
+        n1, n2 = self.n1, self.n2
+        pooled_estimate = (n1 * self.p1 + n2 * self.p2) / (n1 + n2)
+        self.pooled_estimate = pooled_estimate
+        return np.sqrt(pooled_estimate * (1 - pooled_estimate) * ((n1 + n2) / (n1 * n2)))
+
+    @property
+    def pvalue(self):
+        return self.batch.pvalue
@@ -0,0 +1,13 @@
+""" Tests of relationships between variables. Classes are imported on
+first access.
+"""
+
+from stats import lazy_attributes
+
+_ATTRIBUTES = {
+    'PearsonCorrelation' : 'correlation_tests',
+    'SpearmanRankCorrelation' : 'correlation_tests',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
+__all__ = sorted(_ATTRIBUTES)
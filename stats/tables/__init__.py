@@ -0,0 +1,22 @@
+""" Statistical tables and distribution functions. Loaders are imported
+on first access; pandas is only imported to read a CSV table.
+"""
+
+from stats import lazy_attributes
+
+_ATTRIBUTES = {
+    'LoadChi2Table' : 'load_table',
+    'LoadFTable' : 'load_table',
+    'LoadNormalTable' : 'load_table',
+    'LoadStudentsTTable' : 'load_table',
+    'clear_critical_value_cache' : 'critical_values',
+    'clear_exact_cache' : 'exact_rank_tables',
+    'clear_table_cache' : 'load_table',
+    'critical_value' : 'critical_values',
+    'get_table' : 'load_table',
+    'rank_sum_pvalue' : 'exact_rank_tables',
+    'signed_rank_pvalue' : 'exact_rank_tables',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
+__all__ = sorted(_ATTRIBUTES)
@@ -0,0 +1,90 @@
+""" Compile the CSV tables into .npy files for fast, pandas-free loading.
+
+Run after editing any of the CSV tables:
+
+    python -m stats.tables.build_tables
+
+Each table is saved as one 2-D float array. The first row holds the
+column labels, the first column the row labels (degrees of freedom or
+Z-score), and the top-left corner is NaN.
+
+The F tables are themselves generated from `distributions.f_ppf`:
+
+    python -m stats.tables.build_tables --f-tables
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+from __future__ import print_function
+
+import numpy as np
+import os
+import sys
+
+from stats.tables import distributions
+from stats.tables.load_table import (F_ALPHAS, F_TABLES, TABLE_FILES,
+    compiled_path, p, read_csv_table)
+
+# Degrees of freedom of the F tables, as laid out in printed tables.
+F_DFN = list(range(1, 11)) + [12, 15, 20, 24, 30, 40, 60, 120, np.inf]
+F_DFD = list(range(1, 31)) + [40, 60, 120, np.inf]
+
+
+def build_table(name):
+    """ Compile one table.
+
+    Parameters
+    ----------
+    name : str
+        One of the keys of `TABLE_FILES`.
+
+    Returns
+    -------
+    path : str
+        The .npy file written.
+    """
+    table = read_csv_table(name)
+    grid = np.empty((len(table.index) + 1, len(table.columns) + 1))
+    grid[0, 0] = np.nan
+    grid[0, 1:] = table.labels
+    grid[1:, 0] = table.index
+    grid[1:, 1:] = table.values
+    path = compiled_path(name)
+    np.save(path, grid)
+    return path
+
+def write_f_tables():
+    """ Write the F table CSVs, one per tail area in `F_ALPHAS`.
+    """
+    dfn, dfd = np.meshgrid(F_DFN, F_DFD)
+    for name, alpha in zip(F_TABLES, F_ALPHAS):
+        values = distributions.f_ppf(np.full(dfn.shape, 1.0 - alpha), dfn, dfd)
+        path = os.path.join(p, TABLE_FILES[name][0])
+        with open(path, 'w') as f:
+            f.write(','.join(['dfd'] + [_df_label(df) for df in F_DFN]) + '\n')
+            for df, row in zip(F_DFD, values):
+                f.write(','.join([_df_label(df)] +
+                    ['{:g}'.format(round(val, 3)) for val in row]) + '\n')
+        print(path)
+
+def _df_label(df):
+    return 'INF' if np.isinf(df) else str(df)
+
+def build_tables():
+    """ Compile every table in `TABLE_FILES`.
+    """
+    for name in sorted(TABLE_FILES):
+        print(build_table(name))
+
+
+if __name__ == '__main__':
+    if '--f-tables' in sys.argv:
+        write_f_tables()
+    build_tables()
@@ -0,0 +1,74 @@
+""" Memoized critical values of the normal, Student's t and chi-square
+distributions.
+
+Critical values only depend on the distribution, degrees of freedom,
+significance level and number of tails, so they are cached (with bounded
+LRU eviction) and a batch of decisions costs one lookup per unique
+combination.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+from functools import lru_cache
+
+from stats.tables.load_table import LoadNormalTable, LoadStudentsTTable, LoadChi2Table
+
+# Maximum number of (distribution, df, alpha, tails, backend) entries kept.
+CACHE_SIZE = 4096
+
+
+def critical_value(distribution, alpha, tails=1, df=None, backend='table'):
+    """ The critical value of a test statistic.
+
+    Parameters
+    ----------
+    distribution : {'normal', 't', 'chi2'}
+        Distribution of the test statistic.
+    alpha : float
+        Significance level.
+    tails : int
+        1 or 2. With 2, alpha is split evenly between the tails. The
+        chi-square test is always upper-tailed.
+    df : int
+        Degrees of freedom, for 't' and 'chi2'.
+    backend : {'table', 'analytic'}
+        Nearest table entry or exact quantile.
+
+    Returns
+    -------
+    critical_value : float
+        The (positive) value the test statistic must reach to reject the
+        null hypothesis.
+    """
+    return _critical_value(distribution, df, float(alpha), int(tails), backend)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _critical_value(distribution, df, alpha, tails, backend):
+    if distribution == 'normal':
+        table = LoadNormalTable(backend=backend)
+        # The normal table gives the area between 0 and Z.
+        return table.find_z(0.5 - alpha / tails)
+    elif distribution == 't':
+        table = LoadStudentsTTable(tails=1, backend=backend)
+        return table.find_t(df, confidence=1.0 - alpha / tails)
+    elif distribution == 'chi2':
+        table = LoadChi2Table(backend=backend)
+        return table.find_chi2(df, confidence=1.0 - alpha)
+    raise ValueError("Unknown distribution '{}'".format(distribution))
+
+def critical_value_cache_info():
+    """ Hits, misses and size of the critical-value cache.
+    """
+    return _critical_value.cache_info()
+
+def clear_critical_value_cache():
+    """ Empty the critical-value cache.
+    """
+    _critical_value.cache_clear()
@@ -0,0 +1,217 @@
+""" Exact null distributions of rank statistics, for small samples where
+the normal approximation is poor.
+
+Each distribution is built once by dynamic programming and kept, as
+read-only NumPy arrays, in a bounded LRU cache, so repeated tests with
+the same sample sizes cost a dictionary lookup.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    H.B. Mann and D.R. Whitney, "On a Test of Whether one of Two Random
+    Variables is Stochastically Larger than the Other", 1947
+
+    F. Wilcoxon, "Individual Comparisons by Ranking Methods", 1945
+
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Number of distributions of each statistic kept.
+CACHE_SIZE = 1024
+
+# Largest sample sizes with exact distributions. The rank-sum table has
+# (n1 + 1) x n1 (n1 + 2 n2 + 1) / 2 entries, built in n1^2 (n1 + n2)
+# row updates; the signed-rank counts reach 2^n, which must stay finite
+# in floating point.
+RANK_SUM_MAX_N = 50
+SIGNED_RANK_MAX_N = 1000
+
+
+def rank_sum_distribution(n1, n2):
+    """ Null distribution of W, the sum of the ranks of sample 1 among
+    the n1 + n2 pooled observations (no ties).
+
+    Parameters
+    ----------
+    n1, n2 : int
+        Sample sizes, at most `RANK_SUM_MAX_N` each.
+
+    Returns
+    -------
+    w_min : int
+        Smallest possible W, n1 (n1 + 1) / 2.
+    cdf : array
+        P(W <= w_min + i), read-only.
+    sf : array
+        P(W >= w_min + i), read-only.
+    """
+    if max(n1, n2) > RANK_SUM_MAX_N:
+        raise ValueError("exact rank-sum distributions are limited to samples "
+                         "of {} (got {:g} and {:g}); use the normal "
+                         "approximation".format(RANK_SUM_MAX_N, n1, n2))
+    return _rank_sum_distribution(int(n1), int(n2))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _rank_sum_distribution(n1, n2):
+    N = n1 + n2
+    w_min = n1 * (n1 + 1) // 2
+    w_max = n1 * (2 * N - n1 + 1) // 2
+    # counts[k, w]: number of k-subsets of the ranks seen so far summing
+    # to w. Add ranks 1..N in turn, largest subsets first.
+    counts = np.zeros((n1 + 1, w_max + 1))
+    counts[0, 0] = 1.0
+    for rank in range(1, N + 1):
+        for k in range(min(rank, n1), 0, -1):
+            counts[k, rank:] += counts[k - 1, :-rank]
+    pmf = counts[n1, w_min:]
+    pmf = pmf / pmf.sum()
+    cdf = np.minimum(np.cumsum(pmf), 1.0)
+    sf = np.minimum(np.cumsum(pmf[::-1])[::-1], 1.0)
+    cdf.setflags(write=False)
+    sf.setflags(write=False)
+    return w_min, cdf, sf
+
+def rank_sum_cdf(w, n1, n2):
+    """ P(W <= w) for the rank sum of sample 1. Works on arrays of w.
+    """
+    w_min, cdf, sf = rank_sum_distribution(n1, n2)
+    return _unwrap(_lookup_cdf(w, w_min, cdf))
+
+def rank_sum_sf(w, n1, n2):
+    """ P(W >= w) for the rank sum of sample 1. Works on arrays of w.
+    """
+    w_min, cdf, sf = rank_sum_distribution(n1, n2)
+    return _unwrap(_lookup_sf(w, w_min, sf))
+
+def rank_sum_pvalue(w, n1, n2, rejection=2):
+    """ Exact p-value of the rank sum w of sample 1.
+
+    Parameters
+    ----------
+    rejection : int
+        If 2, two-tailed (twice the smaller tail). If 1, P(W >= w). If
+        -1, P(W <= w).
+    """
+    if rejection == 1:
+        return rank_sum_sf(w, n1, n2)
+    elif rejection == -1:
+        return rank_sum_cdf(w, n1, n2)
+    tails = np.minimum(rank_sum_cdf(w, n1, n2), rank_sum_sf(w, n1, n2))
+    return _unwrap(np.minimum(2.0 * np.asarray(tails), 1.0))
+
+def signed_rank_distribution(n):
+    """ Null distribution of T+, the sum of the ranks of the positive
+    differences among n nonzero differences (no ties).
+
+    Parameters
+    ----------
+    n : int
+        Number of nonzero differences, at most `SIGNED_RANK_MAX_N`.
+
+    Returns
+    -------
+    cdf : array
+        P(T+ <= t) for t = 0, 1, ..., n (n + 1) / 2, read-only.
+    sf : array
+        P(T+ >= t), read-only.
+    """
+    if n > SIGNED_RANK_MAX_N:
+        raise ValueError("exact signed-rank distributions are limited to {} "
+                         "differences (got {:g}); use the normal "
+                         "approximation".format(SIGNED_RANK_MAX_N, n))
+    return _signed_rank_distribution(int(n))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _signed_rank_distribution(n):
+    t_max = n * (n + 1) // 2
+    # counts[t]: number of subsets of the ranks seen so far summing to t.
+    counts = np.zeros(t_max + 1)
+    counts[0] = 1.0
+    for rank in range(1, n + 1):
+        counts[rank:] += counts[:-rank].copy()
+    pmf = counts / counts.sum()
+    cdf = np.minimum(np.cumsum(pmf), 1.0)
+    sf = np.minimum(np.cumsum(pmf[::-1])[::-1], 1.0)
+    cdf.setflags(write=False)
+    sf.setflags(write=False)
+    return cdf, sf
+
+def signed_rank_cdf(t, n):
+    """ P(T+ <= t). Works on arrays of t and n, with one distribution per
+    distinct n.
+    """
+    return _unwrap(_by_size(t, n, lambda t, n: _lookup_cdf(
+        t, 0, signed_rank_distribution(n)[0])))
+
+def signed_rank_sf(t, n):
+    """ P(T+ >= t). Works on arrays of t and n, with one distribution per
+    distinct n.
+    """
+    return _unwrap(_by_size(t, n, lambda t, n: _lookup_sf(
+        t, 0, signed_rank_distribution(n)[1])))
+
+def signed_rank_pvalue(t, n, rejection=2):
+    """ Exact p-value of T+, the sum of the ranks of the positive
+    differences.
+
+    Parameters
+    ----------
+    rejection : int
+        If 2, two-tailed (twice the smaller tail). If 1, P(T+ >= t). If
+        -1, P(T+ <= t).
+    """
+    if rejection == 1:
+        return signed_rank_sf(t, n)
+    elif rejection == -1:
+        return signed_rank_cdf(t, n)
+    tails = np.minimum(signed_rank_cdf(t, n), signed_rank_sf(t, n))
+    return _unwrap(np.minimum(2.0 * np.asarray(tails), 1.0))
+
+def exact_cache_info(statistic='rank_sum'):
+    """ Hits, misses and size of the cache of exact distributions of
+    'rank_sum' or 'signed_rank'.
+    """
+    if statistic == 'signed_rank':
+        return _signed_rank_distribution.cache_info()
+    return _rank_sum_distribution.cache_info()
+
+def clear_exact_cache():
+    """ Empty the caches of exact distributions.
+    """
+    _rank_sum_distribution.cache_clear()
+    _signed_rank_distribution.cache_clear()
+
+def _lookup_cdf(w, w_min, cdf):
+    i = np.floor(np.asarray(w, dtype=float)).astype(np.int64) - w_min
+    return np.where(i < 0, 0.0, cdf[np.clip(i, 0, cdf.size - 1)])
+
+def _lookup_sf(w, w_min, sf):
+    i = np.ceil(np.asarray(w, dtype=float)).astype(np.int64) - w_min
+    return np.where(i >= sf.size, 0.0, sf[np.clip(i, 0, sf.size - 1)])
+
+def _by_size(t, n, lookup):
+    """ Apply `lookup(t, n)` to each group of entries sharing a size n.
+    """
+    t, n = np.broadcast_arrays(np.asarray(t, dtype=float), np.asarray(n))
+    if n.ndim == 0:
+        return lookup(t, int(n))
+    result = np.empty(t.shape)
+    for size in np.unique(n):
+        mask = n == size
+        result[mask] = lookup(t[mask], int(size))
+    return result
+
+def _unwrap(result):
+    if np.ndim(result) == 0:
+        return float(result)
+    return result
@@ -13,39 +13,260 @@ References:
     "Introduction to Statistical Problem Solving in Geography", 
     J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
 
-To Do:
+Compiled tables:
 
-    Should tables interpolate?
+    `build_tables.py` converts each CSV into a .npy file next to it. When
+    that file exists it is memory-mapped instead of parsing the CSV, so
+    worker processes share its pages and pandas is never imported. pandas
+    is only needed to read the CSVs themselves, or for `StatTable.frame`.
+
+Interpolation:
+
+    With `interpolate=True` the loaders bracket the input between two
+    table entries and interpolate linearly,
 
     y = y1 + ((x - x1) / (x2 - x1)) * (y2 - y1)
 
+    both along the statistic axis and across degrees of freedom. The t
+    tables are interpolated in 1/df, which is linear near infinity.
+
 """
 
 import numpy as np
-import pandas as pd
 import os
+import threading
+
+from stats.tables import distributions
 
 # Get absolute path to table files.
 p = os.path.abspath(__file__)
 p = '/'.join(p.split('/')[:-1])
 
-class LoadTable(object):
+# Table name -> (file name, name of the index column).
+TABLE_FILES = {
+    'normal' : ('normal_table.csv', 'z'),
+    't_one_tail' : ('students_t_table_one_tail.csv', 'df'),
+    't_two_tail' : ('students_t_table_two_tail.csv', 'df'),
+    'chi2' : ('chi_square_table.csv', 'df')
+}
+
+# The F distribution has one table per tail area, with the denominator df
+# down the rows and the numerator df across the columns.
+F_ALPHAS = (0.1, 0.05, 0.025, 0.01, 0.001)
+F_TABLES = tuple('f_{:g}'.format(alpha) for alpha in F_ALPHAS)
+for name, alpha in zip(F_TABLES, F_ALPHAS):
+    TABLE_FILES[name] = ('f_table_{:g}.csv'.format(alpha), 'dfd')
+
+# 'table' looks up the nearest entry of the CSV tables; 'analytic' computes
+# the distribution functions in `stats.tables.distributions`.
+BACKENDS = ('table', 'analytic')
+
+
+class StatTable(object):
+    """ An immutable statistical table, shared by every loader in the
+    process.
+
+    The row index, column labels and values are kept as read-only NumPy
+    arrays. The `frame` attribute hands out a pandas view over those same
+    arrays, so callers cannot change the cached copy.
     """
+    def __init__(self, name, index, columns, values):
+        """
+        Parameters
+        ----------
+        name : str
+            Name of the table in the registry.
+        index : array
+            Row labels (Z-score or degrees of freedom).
+        columns : list of str
+            Column labels as they appear in the CSV header.
+        values : 2-D array
+            Table entries.
+        """
+        self.name = name
+        self.index = _read_only(index)
+        self.columns = tuple(columns)
+        self.values = _read_only(np.asarray(values, dtype=float))
+        self._frame = None
+
+        # Numeric copies of the axes, sorted for binary search.
+        self.labels = _read_only(np.array(self.columns, dtype=float))
+        self.row_order = _read_only(np.argsort(self.index, kind='mergesort'))
+        self.sorted_index = _read_only(np.asarray(self.index, dtype=float)[self.row_order])
+        self.label_order = _read_only(np.argsort(self.labels, kind='mergesort'))
+        self.sorted_labels = _read_only(self.labels[self.label_order])
+        self._derived = {}
+
+    def derived(self, key, build):
+        """ Memoize an array derived from the table, e.g. a search grid.
+
+        Parameters
+        ----------
+        key : str
+            Name of the derived quantity.
+        build : function
+            Called with the table on first use.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived.setdefault(key, build(self))
+        return value
+
+    @property
+    def frame(self):
+        """ A pandas DataFrame view of the table.
+        """
+        if self._frame is None:
+            import pandas as pd
+            self._frame = pd.DataFrame(self.values, index=self.index,
+                columns=list(self.columns), copy=False)
+        # Shallow copy so that column assignment stays local to the caller.
+        return self._frame.copy(deep=False)
+
+
+class TableRegistry(object):
+    """ Process-wide, thread-safe cache of statistical tables. Each table
+    is read from disk lazily, the first time it is asked for.
     """
-    def __init__(self, filename):
-        self.filename = filename
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
 
-    def load_table(self):
-        table = pd.read_csv(self.filename)
+    def get(self, name):
+        """ Return the cached table, loading it on first use.
+
+        Parameters
+        ----------
+        name : str
+            One of the keys of `TABLE_FILES`.
+
+        Returns
+        -------
+        table : StatTable
+        """
+        table = self._tables.get(name)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(name)
+                if table is None:
+                    table = read_table(name)
+                    self._tables[name] = table
         return table
 
+    def clear(self):
+        """ Drop every cached table. Mostly useful for tests.
+        """
+        with self._lock:
+            self._tables.clear()
+
+    def __contains__(self, name):
+        return name in self._tables
+
+
+_registry = TableRegistry()
+
+def get_table(name):
+    """ Return the shared `StatTable` called `name`.
+    """
+    return _registry.get(name)
+
+def clear_table_cache():
+    """ Empty the shared table registry.
+    """
+    _registry.clear()
+
+def read_table(name):
+    """ Read a table, from its compiled .npy file if it has been built and
+    from its CSV file otherwise.
+
+    Parameters
+    ----------
+    name : str
+        One of the keys of `TABLE_FILES`.
+
+    Returns
+    -------
+    table : StatTable
+    """
+    if os.path.exists(compiled_path(name)):
+        return read_compiled_table(name)
+    return read_csv_table(name)
+
+def read_csv_table(name):
+    """ Read a table from its CSV file.
+    """
+    import pandas as pd
+    filename, index_col = TABLE_FILES[name]
+    temp_table = pd.read_csv(os.path.join(p, filename)).set_index(index_col)
+    return StatTable(name, temp_table.index.to_numpy(),
+        list(temp_table), temp_table.to_numpy(dtype=float))
+
+def read_compiled_table(name):
+    """ Memory-map a table from its compiled .npy file. The first row holds
+    the column labels and the first column the row labels.
+    """
+    grid = np.load(compiled_path(name), mmap_mode='r')
+    columns = ['INF' if np.isinf(label) else '%g' % label for label in grid[0, 1:]]
+    return StatTable(name, grid[1:, 0], columns, grid[1:, 1:])
+
+def compiled_path(name):
+    """ Path of the compiled .npy file of a table.
+    """
+    return os.path.join(p, os.path.splitext(TABLE_FILES[name][0])[0] + '.npy')
+
+def _read_only(array):
+    """ A read-only array, copying only if `array` is writeable (so that
+    memory-mapped tables stay mapped).
+    """
+    array = np.asarray(array)
+    if array.flags.writeable:
+        array = array.copy()
+        array.setflags(write=False)
+    return array
+
+
+class LoadTable(object):
+    """ Base class for table loaders. The table itself comes from the
+    shared registry, so creating a loader is cheap. With the analytic
+    backend no table is read at all.
+    """
+    def __init__(self, name, backend='table', interpolate=False):
+        if backend not in BACKENDS:
+            raise ValueError("backend must be one of {}, not '{}'".format(
+                BACKENDS, backend))
+        self.name = name
+        self.backend = backend
+        self.interpolate = interpolate
+        self.filename = os.path.join(p, TABLE_FILES[name][0])
+        self.table = None
+        if backend == 'table':
+            self.table = get_table(name)
+
+    def load_table(self):
+        return get_table(self.name).frame
+
 class LoadNormalTable(LoadTable):
     """ A normal table object.
     """
-    def __init__(self):
-        LoadTable.__init__(self, os.path.join(p, 'normal_table.csv'))
-        temp_table = self.load_table()
-        self.normal_table = temp_table.set_index("z")
+    def __init__(self, backend='table', interpolate=False):
+        """
+
+        Parameters
+        ----------
+        backend : {'table', 'analytic'}
+            Look up the nearest table entry, or compute the exact value.
+        interpolate : {True, False}
+            Interpolate between table entries instead of returning the
+            nearest one.
+        """
+        LoadTable.__init__(self, 'normal', backend, interpolate)
+        if backend == 'table':
+            self._z_grid, self._prob_grid = self.table.derived('z_grid', _z_grid)
+            self._probs, self._z_scores = self.table.derived('prob_grid', _prob_grid)
+
+    @property
+    def normal_table(self):
+        return self.load_table()
 
     def find_z(self, prob, tails=1):
         """ Given probability, return nearest Z-score from normal table.
@@ -65,29 +286,29 @@ class LoadNormalTable(LoadTable):
         z_score : float
             The Z-score or standard score.
         """
-        prob /= float(tails)
-        normal_table = self.normal_table
-
-        # Find closest probability in table
-        nearest_probs = []
-        for col in list(normal_table):
-            nearest_probs.append(find_nearest(normal_table[col], prob))
-        nearest_probs = np.asarray(nearest_probs)
-        final_prob = find_nearest(nearest_probs, prob)
+        return float(self.find_z_array(prob, tails))
 
-        # Return the column and row
-        for col in list(normal_table):
-            if final_prob in list(normal_table[col]):
-                z1 = col
+    def find_z_array(self, prob, tails=1):
+        """ Array version of `find_z`.
 
-        for i in normal_table.index:
-            if final_prob == normal_table[z1][i]:
-                z0 = i
-        
-        # Build Z-score
-        z_score = float(z0) + float(z1)  
+        Parameters
+        ----------
+        prob : array
+            The probabilities.
+        tails : int or array
+            1 or 2. Broadcast against `prob`.
 
-        return z_score
+        Returns
+        -------
+        z_score : array
+            The Z-scores.
+        """
+        prob = np.asarray(prob, dtype=float) / np.asarray(tails, dtype=float)
+        if self.backend == 'analytic':
+            return distributions.norm_ppf(0.5 + prob)
+        if self.interpolate:
+            return np.interp(prob, self._probs, self._z_scores)
+        return self._z_scores[nearest_index(self._probs, prob)]
 
     def find_prob(self, z, tails=1):
         """ Given Z-score, return nearest probability from table.
@@ -105,37 +326,58 @@ class LoadNormalTable(LoadTable):
             The probability, i.e., the area under section of probability
             distriubtion curve.
         """
-        normal_table = self.normal_table
+        return float(self.find_prob_array(z, tails))
 
-        if z > 4:
-            prob = 0.5
-
-        else:
-            z0 = round(z, 1)
-            z1 = str(round(z, 2) - z0)
+    def find_prob_array(self, z, tails=1):
+        """ Array version of `find_prob`.
 
-            prob = round(normal_table[z1][z0], 6)
-            prob *= tails
+        Parameters
+        ----------
+        z : array
+            The Z-scores.
+        tails : int or array
+            1 or 2. Broadcast against `z`.
 
-        return prob
+        Returns
+        -------
+        prob : array
+            The probabilities.
+        """
+        z = np.abs(np.asarray(z, dtype=float))
+        if self.backend == 'analytic':
+            return (distributions.norm_cdf(z) - 0.5) * tails
+        if self.interpolate:
+            prob = np.interp(z, self._z_grid, self._prob_grid)
+        else:
+            prob = np.round(self._prob_grid[nearest_index(self._z_grid, z)], 6)
+        prob = prob * tails
+        return np.where(z > 4, 0.5, prob)
 
 class LoadStudentsTTable(LoadTable):
     """ A normal table object.
     """
-    def __init__(self, tails):
+    def __init__(self, tails, backend='table', interpolate=False):
         """
 
         Parameters
         ----------
         tails : int
             1 or 2.
+        backend : {'table', 'analytic'}
+            Look up the nearest table entry, or compute the exact value.
+        interpolate : {True, False}
+            Interpolate between table entries instead of returning the
+            nearest one.
         """
+        self.tails = tails
         if tails == 1:
-            LoadTable.__init__(self, os.path.join(p, 'students_t_table_one_tail.csv'))
+            LoadTable.__init__(self, 't_one_tail', backend, interpolate)
         else:
-            LoadTable.__init__(self, os.path.join(p, 'students_t_table_two_tail.csv'))
-        temp_table = self.load_table()
-        self.t_table = temp_table.set_index("df")
+            LoadTable.__init__(self, 't_two_tail', backend, interpolate)
+
+    @property
+    def t_table(self):
+        return self.load_table()
 
     def find_t(self, df, confidence=0.95):
         """  Finds the T-value of distribution. The table goes to df-1000,
@@ -156,12 +398,24 @@ class LoadStudentsTTable(LoadTable):
         t_score : float
             The test statistic.
         """
-        t_table = self.t_table
-        nearest_confidence = round(find_nearest(list(t_table), 1.0-confidence), 4)
-        nearest_df = round(find_nearest(t_table.index, df), 0)
-        t_score = round(t_table[str(nearest_confidence)][nearest_df], 4)
+        return float(self.find_t_array(df, confidence))
 
-        return t_score
+    def find_t_array(self, df, confidence=0.95):
+        """ Array version of `find_t`. `df` and `confidence` are broadcast
+        against each other.
+
+        Returns
+        -------
+        t_score : array
+            The test statistics.
+        """
+        if self.backend == 'analytic':
+            alpha = (1.0 - np.asarray(confidence, dtype=float)) / self.tails
+            return distributions.t_ppf(1.0 - alpha, df)
+        if self.interpolate:
+            return interpolate_value_array(self.table, df, confidence,
+                transform=np.reciprocal)
+        return find_value_array(self.table, df, confidence)
 
     def find_confidence(self, t, df):
         """ Finds confidence level (area) of ONE tail of distribution.
@@ -173,25 +427,48 @@ class LoadStudentsTTable(LoadTable):
         df : int
             Degrees of freedom (size of sample).       
         """
-        t_table = self.t_table
-        nearest_df = round(find_nearest(t_table.index, df), 0)
-        nearest_t = round(find_nearest(t_table.loc[nearest_df], t), 6)
-        for col in list(t_table):
-            if nearest_t == round(t_table[col][nearest_df], 6):
-                # Subtract from one to get confidence, divide by two to get
-                # single section on positive side of distribution.
-                confidence = (1.0 - float(col)) / 2.0
-                return confidence
+        return float(self.find_confidence_array(t, df))
+
+    def find_confidence_array(self, t, df):
+        """ Array version of `find_confidence`. `t` and `df` are broadcast
+        against each other.
+
+        Returns
+        -------
+        confidence : array
+            The area of one tail for each test statistic.
+        """
+        if self.backend == 'analytic':
+            t = np.abs(np.asarray(t, dtype=float))
+            return distributions.t_cdf(t, df) - 0.5
+        if self.interpolate:
+            alpha = interpolate_label_array(self.table, df, t,
+                transform=np.reciprocal)
+        else:
+            alpha = self.table.labels[nearest_column_array(self.table, df, t)]
+        # Subtract from one to get confidence, divide by two to get
+        # single section on positive side of distribution.
+        return (1.0 - alpha) / 2.0
 
 class LoadChi2Table(LoadTable):
     """ A normal table object.
     """
-    def __init__(self):
+    def __init__(self, backend='table', interpolate=False):
         """
+
+        Parameters
+        ----------
+        backend : {'table', 'analytic'}
+            Look up the nearest table entry, or compute the exact value.
+        interpolate : {True, False}
+            Interpolate between table entries instead of returning the
+            nearest one.
         """
-        LoadTable.__init__(self, os.path.join(p, 'chi_square_table.csv'))
-        temp_table = self.load_table()
-        self.chi2_table = temp_table.set_index("df")  
+        LoadTable.__init__(self, 'chi2', backend, interpolate)
+
+    @property
+    def chi2_table(self):
+        return self.load_table()
 
     def find_chi2(self, df, confidence=0.95):
         """  Finds the T-value of distribution. The table goes to df-1000,
@@ -212,11 +489,22 @@ class LoadChi2Table(LoadTable):
         chi2 : float
             The test statistic.
         """
-        chi2_table = self.chi2_table
-        nearest_confidence = round(find_nearest(list(chi2_table), 1.0-confidence), 4)
-        nearest_df = round(find_nearest(chi2_table.index, df), 0)
-        chi2 = round(chi2_table[str(nearest_confidence)][nearest_df], 4)
-        return chi2
+        return float(self.find_chi2_array(df, confidence))
+
+    def find_chi2_array(self, df, confidence=0.95):
+        """ Array version of `find_chi2`. `df` and `confidence` are
+        broadcast against each other.
+
+        Returns
+        -------
+        chi2 : array
+            The test statistics.
+        """
+        if self.backend == 'analytic':
+            return distributions.chi2_ppf(confidence, df)
+        if self.interpolate:
+            return interpolate_value_array(self.table, df, confidence)
+        return find_value_array(self.table, df, confidence)
 
     def find_confidence(self, chi2, df):
         """ Finds confidence level (area) of right-hand-side of distribution.
@@ -228,17 +516,380 @@ class LoadChi2Table(LoadTable):
         df : int
             Degrees of freedom (size of sample).
         """
-        chi2_table = self.chi2_table
-        nearest_df = round(find_nearest(chi2_table.index, df), 0)
-        nearest_chi2 = round(find_nearest(chi2_table.loc[nearest_df], chi2), 6)
-        for col in list(chi2_table):
-            if nearest_chi2 == round(chi2_table[col][nearest_df], 6):
-                # Subtract from one to get confidence.
-                confidence = (1.0 - float(col))
-                return confidence
+        return float(self.find_confidence_array(chi2, df))
+
+    def find_confidence_array(self, chi2, df):
+        """ Array version of `find_confidence`. `chi2` and `df` are
+        broadcast against each other.
+
+        Returns
+        -------
+        confidence : array
+            The confidence level for each test statistic.
+        """
+        if self.backend == 'analytic':
+            return distributions.chi2_cdf(chi2, df)
+        if self.interpolate:
+            alpha = interpolate_label_array(self.table, df, chi2)
+        else:
+            alpha = self.table.labels[nearest_column_array(self.table, df, chi2)]
+        # Subtract from one to get confidence.
+        return 1.0 - alpha
+
+class LoadFTable(LoadTable):
+    """ An F table object, made of one table per tail area.
+    """
+    def __init__(self, backend='table', interpolate=False):
+        """
+
+        Parameters
+        ----------
+        backend : {'table', 'analytic'}
+            Look up the nearest table entry, or compute the exact value.
+        interpolate : {True, False}
+            Interpolate between table entries instead of returning the
+            nearest one.
+        """
+        LoadTable.__init__(self, F_TABLES[0], backend, interpolate)
+        self.alphas = np.array(F_ALPHAS)
+        self.cube = None
+        if backend == 'table':
+            self.cube = self.table.derived('f_cube', _f_cube)
+
+    @property
+    def f_tables(self):
+        return dict((alpha, get_table(name).frame)
+                    for alpha, name in zip(F_ALPHAS, F_TABLES))
+
+    def find_f(self, dfn, dfd, confidence=0.95):
+        """ Finds the F-value of distribution. The tables go to df-120,
+        after which all is effectively infinity.
+
+        Parameters
+        ----------
+        dfn : int
+            Degrees of freedom of the numerator (between groups).
+        dfd : int
+            Degrees of freedom of the denominator (within groups).
+        confidence : float
+            The confidence level (area under distribution curve left of F).
+
+        Returns
+        -------
+        F : float
+            The test statistic.
+        """
+        return float(self.find_f_array(dfn, dfd, confidence))
+
+    def find_f_array(self, dfn, dfd, confidence=0.95):
+        """ Array version of `find_f`. `dfn`, `dfd` and `confidence` are
+        broadcast against each other.
+
+        Returns
+        -------
+        F : array
+            The test statistics.
+        """
+        if self.backend == 'analytic':
+            return distributions.f_ppf(confidence, dfn, dfd)
+        dfn, dfd, confidence = np.broadcast_arrays(np.asarray(dfn, dtype=float),
+            np.asarray(dfd, dtype=float), np.asarray(confidence, dtype=float))
+        # The tail areas are descending, the tables ascending in F.
+        alphas = self.alphas[::-1]
+        if self.interpolate:
+            a0, a1, w = bracket(alphas, 1.0 - confidence)
+            n = len(alphas) - 1
+            f0 = self._interpolate_entries(n - a0, dfn, dfd)
+            f1 = self._interpolate_entries(n - a1, dfn, dfd)
+            return _lerp(f0, f1, w)
+        a = len(alphas) - 1 - nearest_index(alphas, 1.0 - confidence, ties='right')
+        row, col = self._nearest_cells(dfn, dfd)
+        return np.round(self.cube[a, row, col], 4)
+
+    def find_confidence(self, f, dfn, dfd):
+        """ Finds confidence level (area) left of the F-value.
+
+        Parameters
+        ----------
+        f : float
+            The test statistic.
+        dfn : int
+            Degrees of freedom of the numerator.
+        dfd : int
+            Degrees of freedom of the denominator.
+        """
+        return float(self.find_confidence_array(f, dfn, dfd))
+
+    def find_confidence_array(self, f, dfn, dfd):
+        """ Array version of `find_confidence`. `f`, `dfn` and `dfd` are
+        broadcast against each other.
+
+        Returns
+        -------
+        confidence : array
+            The confidence level for each test statistic.
+        """
+        if self.backend == 'analytic':
+            return distributions.f_cdf(f, dfn, dfd)
+        f, dfn, dfd = np.broadcast_arrays(np.asarray(f, dtype=float),
+            np.asarray(dfn, dtype=float), np.asarray(dfd, dtype=float))
+        levels = np.arange(len(self.alphas))
+        if self.interpolate:
+            # Critical values at every tail area, ascending along axis 0.
+            values = self._interpolate_entries(levels.reshape((-1,) + (1,) * f.ndim),
+                dfn, dfd)
+            upper = np.clip((values < f).sum(axis=0), 1, len(levels) - 1)
+            lower = upper - 1
+            x1 = np.take_along_axis(values, lower[np.newaxis], 0)[0]
+            x2 = np.take_along_axis(values, upper[np.newaxis], 0)[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weight = np.clip((f - x1) / (x2 - x1), 0.0, 1.0)
+            alpha = _lerp(self.alphas[lower], self.alphas[upper], weight)
+        else:
+            row, col = self._nearest_cells(dfn, dfd)
+            values = self.cube[:, row, col]
+            alpha = self.alphas[np.argmin(np.abs(values - f), axis=0)]
+        # Subtract from one to get confidence.
+        return 1.0 - alpha
+
+    def _nearest_cells(self, dfn, dfd):
+        row = self.table.row_order[nearest_index(self.table.sorted_index, dfd)]
+        col = self.table.label_order[nearest_index(self.table.sorted_labels, dfn)]
+        return row, col
+
+    def _interpolate_entries(self, level, dfn, dfd):
+        """ Entries of the tables at `level` (position in `F_ALPHAS`),
+        interpolated in 1/df between the bracketing rows and columns.
+        """
+        table = self.table
+        r0, r1, w_row = bracket(table.sorted_index, dfd, transform=np.reciprocal)
+        c0, c1, w_col = bracket(table.sorted_labels, dfn, transform=np.reciprocal)
+        r0, r1 = table.row_order[r0], table.row_order[r1]
+        c0, c1 = table.label_order[c0], table.label_order[c1]
+        cube = self.cube
+        y0 = _lerp(cube[level, r0, c0], cube[level, r0, c1], w_col)
+        y1 = _lerp(cube[level, r1, c0], cube[level, r1, c1], w_col)
+        return _lerp(y0, y1, w_row)
+
+def nearest_index(sorted_array, value, ties='left'):
+    """ Binary search for the entries of a sorted array nearest `value`.
+
+    Parameters
+    ----------
+    sorted_array : array
+        Ascending array.
+    value : float or array
+        Value(s) to look up.
+    ties : {'left', 'right'}
+        Which neighbour to return when a value is exactly half-way.
+
+    Returns
+    -------
+    idx : int or array
+        Position(s) in `sorted_array`.
+    """
+    value = np.asarray(value, dtype=float)
+    if value.ndim == 0:
+        return _nearest_index_scalar(sorted_array, float(value), ties)
+    i = np.clip(np.searchsorted(sorted_array, value), 1, len(sorted_array) - 1)
+    below = value - sorted_array[i - 1]
+    above = sorted_array[i] - value
+    if ties == 'left':
+        idx = np.where(below <= above, i - 1, i)
+    else:
+        idx = np.where(below < above, i - 1, i)
+    # Clipping above can point past a single-entry or out-of-range value.
+    idx = np.where(value <= sorted_array[0], 0, idx)
+    idx = np.where(value >= sorted_array[-1], len(sorted_array) - 1, idx)
+    return idx
+
+def _nearest_index_scalar(sorted_array, value, ties):
+    i = int(np.searchsorted(sorted_array, value))
+    if i == 0:
+        return 0
+    if i == len(sorted_array):
+        return i - 1
+    below = value - sorted_array[i - 1]
+    above = sorted_array[i] - value
+    if below < above or (below == above and ties == 'left'):
+        return i - 1
+    return i
+
+def find_value_array(table, df, confidence):
+    """ Table entries at the degrees of freedom and column nearest `df`
+    and `1 - confidence`.
+    """
+    df, confidence = np.broadcast_arrays(np.asarray(df, dtype=float),
+        np.asarray(confidence, dtype=float))
+    row = table.row_order[nearest_index(table.sorted_index, df)]
+    col = table.label_order[nearest_index(table.sorted_labels,
+        1.0 - confidence, ties='right')]
+    return np.round(table.values[row, col], 4)
+
+def nearest_column_array(table, df, value):
+    """ Column positions of the entries nearest `value`, each searched in
+    the row nearest its `df`. The table rows increase from left to right;
+    missing (NaN) entries are skipped.
+    """
+    value, df = np.broadcast_arrays(np.asarray(value, dtype=float),
+        np.asarray(df, dtype=float))
+    rows = table.row_order[nearest_index(table.sorted_index, df)]
+    grid, source = table.derived('filled_rows', _filled_rows)
+    ncols = grid.shape[1]
+
+    lo = row_searchsorted(grid, rows, value)
+    i = np.clip(lo, 1, ncols - 1)
+    below = value - grid[rows, i - 1]
+    above = grid[rows, i] - value
+    col = np.where(below <= above, i - 1, i)
+    col = np.where(lo == 0, 0, col)
+    col = np.where(lo == ncols, ncols - 1, col)
+    return source[rows, col]
+
+def row_searchsorted(grid, rows, value):
+    """ For each value, the position of the first entry >= value in its
+    row of `grid`, whose rows are ascending.
+    """
+    ncols = grid.shape[1]
+    if value.ndim == 0:
+        return np.searchsorted(grid[rows], value)
+
+    # Binary search within each row, all rows at once.
+    lo = np.zeros(value.shape, dtype=int)
+    hi = np.full(value.shape, ncols)
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        active = lo < hi
+        go_right = active & (grid[rows, np.minimum(mid, ncols - 1)] < value)
+        lo = np.where(go_right, mid + 1, lo)
+        hi = np.where(active & ~go_right, mid, hi)
+    return lo
+
+def bracket(sorted_array, value, transform=None):
+    """ The entries of a sorted array on either side of `value`, and the
+    linear weight of the upper one. Values off either end of the array are
+    clamped to that end.
+
+    Parameters
+    ----------
+    sorted_array : array
+        Ascending array.
+    value : array
+        Value(s) to bracket.
+    transform : function
+        Interpolate in transform(x) rather than x, e.g. `np.reciprocal`.
+
+    Returns
+    -------
+    lower, upper : array
+        Positions in `sorted_array`.
+    weight : array
+        Between 0 (at `lower`) and 1 (at `upper`).
+    """
+    value = np.asarray(value, dtype=float)
+    upper = np.clip(np.searchsorted(sorted_array, value), 1, len(sorted_array) - 1)
+    lower = upper - 1
+    x, x1, x2 = value, sorted_array[lower], sorted_array[upper]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if transform is not None:
+            x, x1, x2 = transform(x), transform(x1), transform(x2)
+        weight = np.clip((x - x1) / (x2 - x1), 0.0, 1.0)
+    return lower, upper, weight
+
+def interpolate_value_array(table, df, confidence, transform=None):
+    """ Table entries interpolated between the two rows bracketing `df`
+    and the two columns bracketing `1 - confidence`.
+    """
+    df, confidence = np.broadcast_arrays(np.asarray(df, dtype=float),
+        np.asarray(confidence, dtype=float))
+    r0, r1, w_row = bracket(table.sorted_index, df, transform)
+    r0, r1 = table.row_order[r0], table.row_order[r1]
+    c0, c1, w_col = bracket(table.sorted_labels, 1.0 - confidence)
+    c0, c1 = table.label_order[c0], table.label_order[c1]
+
+    values = table.values
+    y0 = _lerp(values[r0, c0], values[r0, c1], w_col)
+    y1 = _lerp(values[r1, c0], values[r1, c1], w_col)
+    return _lerp(y0, y1, w_row)
+
+def interpolate_label_array(table, df, value, transform=None):
+    """ Column labels (tail areas) interpolated along the rows bracketing
+    `df`, then across those two rows. Missing (NaN) entries are skipped.
+    """
+    value, df = np.broadcast_arrays(np.asarray(value, dtype=float),
+        np.asarray(df, dtype=float))
+    r0, r1, w_row = bracket(table.sorted_index, df, transform)
+    label0 = _interpolate_in_row(table, table.row_order[r0], value)
+    label1 = _interpolate_in_row(table, table.row_order[r1], value)
+    return _lerp(label0, label1, w_row)
+
+def _interpolate_in_row(table, rows, value):
+    grid, source = table.derived('filled_rows', _filled_rows)
+    ncols = grid.shape[1]
+    upper = np.clip(row_searchsorted(grid, rows, value), 1, ncols - 1)
+    lower = upper - 1
+    x1, x2 = grid[rows, lower], grid[rows, upper]
+    y1 = table.labels[source[rows, lower]]
+    y2 = table.labels[source[rows, upper]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(x2 > x1, (value - x1) / (x2 - x1), value > x1)
+    return _lerp(y1, y2, np.clip(weight, 0.0, 1.0))
+
+def _lerp(y1, y2, weight):
+    """ y1 + weight * (y2 - y1), returning y1 or y2 exactly (even if the
+    other is NaN) at weights of 0 and 1.
+    """
+    with np.errstate(invalid='ignore'):
+        y = y1 + weight * (y2 - y1)
+    y = np.where(weight == 0, y1, y)
+    return np.where(weight == 1, y2, y)
 
 def find_nearest(array, value):
-    array = np.array(array, dtype=float)
-    value = float(value)
-    idx = pd.Series((np.abs(array-value))).idxmin()
+    """ Return the entry of an (unsorted) array nearest `value`.
+    """
+    array = np.asarray(array, dtype=float)
+    idx = np.nanargmin(np.abs(array - float(value)))
     return array[idx]
+
+def _filled_rows(table):
+    """ The table with each missing entry replaced by the entry to its
+    left, and the column each entry was taken from.
+    """
+    grid = np.array(table.values)
+    source = np.tile(np.arange(grid.shape[1]), (grid.shape[0], 1))
+    for j in range(1, grid.shape[1]):
+        missing = np.isnan(grid[:, j])
+        grid[missing, j] = grid[missing, j - 1]
+        source[missing, j] = source[missing, j - 1]
+    return _read_only(grid), _read_only(source)
+
+def _f_cube(table):
+    """ The F tables stacked along a first axis of tail areas, in the
+    order of `F_ALPHAS`. They all share the same rows and columns.
+    """
+    return _read_only(np.stack([get_table(name).values for name in F_TABLES]))
+
+def _z_grid(table):
+    """ Every Z-score of the normal table (row + column), in ascending
+    order, with the matching probabilities.
+    """
+    z0 = np.asarray(table.sorted_index, dtype=float)
+    z1 = np.sort(table.labels)
+    values = table.values[table.row_order][:, np.argsort(table.labels)]
+    z_grid = (z0[:, np.newaxis] + z1[np.newaxis, :]).ravel()
+    return _read_only(z_grid), _read_only(values.ravel())
+
+def _prob_grid(table):
+    """ The distinct probabilities of the normal table, in ascending order,
+    with the Z-score each one maps back to. A probability listed more than
+    once maps to its last column, then its last row in that column.
+    """
+    values = table.values
+    probs = np.unique(values)
+    z_scores = np.empty(len(probs))
+    for i, prob in enumerate(probs):
+        rows, cols = np.nonzero(values == prob)
+        col = cols.max()
+        row = rows[cols == col].max()
+        z_scores[i] = float(table.index[row]) + float(table.columns[col])
+    return _read_only(probs), _read_only(z_scores)
@@ -0,0 +1,98 @@
+""" Verification tests for the bootstrap confidence intervals.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+from stats.inferential_stats.bootstrap import *
+
+
+def median(x):
+    return np.median(x, axis=1)
+
+def gathered_mean_difference(x1, x2):
+    return x1.mean(axis=1) - x2.mean(axis=1)
+
+
+class TestBootstrap(object):
+    def setup(self):
+        rng = np.random.default_rng(0)
+        return rng.exponential(1, 50), rng.normal(0, 1, 30)
+
+    def test_percentile(self):
+        x, y = self.setup()
+        boot = Bootstrap(x, seed=1)
+        lower, upper = boot.percentile()
+        assert lower == pytest.approx(np.quantile(boot.replicates, 0.025))
+        assert upper == pytest.approx(np.quantile(boot.replicates, 0.975))
+        assert lower < x.mean() < upper
+
+    def test_acceleration(self):
+        # For the mean, a = sum(d^3) / (6 sum(d^2)^1.5) with d = x - mean.
+        x, y = self.setup()
+        d = x - x.mean()
+        expected = np.sum(d**3) / (6 * np.sum(d**2)**1.5)
+        assert Bootstrap(x, n_resamples=10).acceleration() == pytest.approx(expected)
+
+    def test_bca_skewed(self):
+        # Right skew shifts the BCa interval up from the percentile one.
+        x, y = self.setup()
+        boot = Bootstrap(x, seed=1)
+        assert boot.bca()[1] > boot.percentile()[1]
+
+    def test_counts_match_gather(self):
+        x, y = self.setup()
+        named = Bootstrap([x, y], 'mean_difference', n_resamples=500, seed=2)
+        custom = Bootstrap([x, y], gathered_mean_difference, n_resamples=500, seed=2)
+        assert np.allclose(named.replicates, custom.replicates)
+        assert np.allclose(named.bca(), custom.bca())
+
+    def test_metrics(self):
+        rng = np.random.default_rng(3)
+        x1 = rng.integers(0, 2, (200, 40))
+        x2 = rng.integers(0, 2, (150, 40))
+        boot = Bootstrap([x1, x2], 'proportion_difference', n_resamples=1000,
+                         max_bytes=2**16, seed=0)
+        assert boot.chunk_size < 1000
+        lower, upper = boot.interval(0.9)
+        assert lower.shape == upper.shape == (40,)
+        assert np.all(lower < boot.observed) and np.all(boot.observed < upper)
+
+    def test_custom_statistic(self):
+        x, y = self.setup()
+        boot = Bootstrap(x, median, n_resamples=1000, max_bytes=8000, seed=0)
+        lower, upper = boot.bca()
+        assert lower < np.median(x) < upper
+
+    def test_jackknife_memory(self):
+        # The (n, n - 1) leave-one-out indices alone would take 128 MB.
+        x = np.random.default_rng(4).normal(size=4000)
+        boot = Bootstrap(x, median, n_resamples=100, max_bytes=2**20, seed=0)
+        tracemalloc.start()
+        try:
+            boot.bca()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < 2**24
+
+    def test_reproducible(self):
+        x, y = self.setup()
+        serial = Bootstrap(x, n_resamples=1000, max_bytes=8000, seed=5)
+        pooled = Bootstrap(x, n_resamples=1000, max_bytes=8000, seed=5, workers=2)
+        assert np.array_equal(serial.replicates, pooled.replicates)
+
+    def test_wrong_number_of_samples(self):
+        x, y = self.setup()
+        with pytest.raises(ValueError):
+            Bootstrap(x, 'mean_difference')
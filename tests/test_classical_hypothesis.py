@@ -0,0 +1,75 @@
+""" Verification tests for the classical hypothesis tests.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    "Introduction to Statistical Problem Solving in Geography",
+    J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
+
+"""
+
+import pytest
+from stats.inferential_stats.classical_hypothesis import *
+from stats.tables.critical_values import *
+
+
+class TestCriticalValue(object):
+    def test_normal_one_tail(self):
+        assert round(critical_value('normal', 0.05, tails=1), 2) == 1.64
+
+    def test_normal_two_tail(self):
+        assert round(critical_value('normal', 0.05, tails=2), 2) == 1.96
+
+    def test_t(self):
+        assert critical_value('t', 0.05, tails=2, df=9) == 2.262
+
+    def test_chi2(self):
+        assert critical_value('chi2', 0.05, df=4) == 9.488
+
+    def test_analytic(self):
+        val = critical_value('normal', 0.05, tails=1, backend='analytic')
+        assert round(val, 3) == 1.645
+
+    def test_cached(self):
+        clear_critical_value_cache()
+        for i in range(5):
+            critical_value('t', 0.01, tails=2, df=20)
+        info = critical_value_cache_info()
+        assert info.misses == 1
+        assert info.hits == 4
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError):
+            critical_value('f', 0.05)
+
+
+class TestOneSampleDifferenceMeans(object):
+    def setup(self, rejection=2, n=40):
+        return OneSampleDifferenceMeans(hyp_mean=50, mean=53, n=n, stddev=8,
+                                        alpha=0.05, rejection=rejection)
+
+    def test_test_stat(self):
+        test = self.setup()
+        assert round(test.test_stat, 2) == 2.37
+
+    def test_reject_two_tail(self):
+        test = self.setup()
+        assert test.critical_value == 1.96
+        assert test.decision == False
+
+    def test_wrong_tail(self):
+        test = self.setup(rejection=-1)
+        assert test.decision == True
+
+    def test_small_sample(self):
+        # t = 3 / (8 / sqrt(9)) = 1.125 with df 9.
+        test = self.setup(n=10)
+        assert test.critical_value == 2.262
+        assert test.decision == True
@@ -0,0 +1,175 @@
+""" Tests for the analytic distribution functions.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    "Introduction to Statistical Problem Solving in Geography",
+    J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
+
+"""
+
+import math
+import warnings
+
+import numpy as np
+import pytest
+from stats.tables.distributions import *
+from stats.tables.load_table import *
+
+
+class TestSpecialFunctions(object):
+    def test_gammaln(self):
+        x = np.array([0.5, 1.0, 4.5, 30.0, 171.0])
+        expected = [math.lgamma(val) for val in x]
+        assert np.allclose(gammaln(x), expected, rtol=1e-13)
+
+    def test_erf(self):
+        x = np.linspace(-5, 5, 41)
+        expected = [math.erf(val) for val in x]
+        assert np.allclose(erf(x), expected, rtol=0, atol=1e-15)
+
+    def test_erfc_tail(self):
+        assert erfc(10.0) == pytest.approx(math.erfc(10.0), rel=1e-13)
+
+
+class TestNormal(object):
+    def test_cdf(self):
+        assert round(norm_cdf(1.96), 4) == 0.975
+
+    def test_ppf_roundtrip(self):
+        p = np.array([1e-10, 0.01, 0.3, 0.5, 0.9, 0.999])
+        assert np.allclose(norm_cdf(norm_ppf(p)), p, rtol=1e-12)
+
+    def test_matches_table(self):
+        table = get_table('normal')
+        z = np.asarray(table.index)[:, np.newaxis] + table.labels[np.newaxis, :]
+        assert np.allclose(norm_cdf(z) - 0.5, table.values, atol=1e-5)
+
+
+class TestStudentsT(object):
+    def test_sf(self):
+        assert round(t_sf(2.96, 9), 4) == 0.008
+
+    def test_ppf(self):
+        assert round(t_ppf(0.975, 9), 3) == 2.262
+
+    def test_infinite_df(self):
+        assert t_sf(1.645, np.inf) == pytest.approx(norm_sf(1.645))
+
+    def test_matches_table(self):
+        table = get_table('t_one_tail')
+        df = np.asarray(table.index, dtype=float)[:, np.newaxis]
+        t = t_ppf(1.0 - table.labels[np.newaxis, :], df)
+        # The printed table is only good to about three decimals.
+        assert np.allclose(t[df[:, 0] < 100], table.values[df[:, 0] < 100], rtol=1e-3)
+
+
+class TestChiSquare(object):
+    def test_sf(self):
+        assert round(chi2_sf(3.96, 4), 2) == 0.41
+
+    def test_ppf(self):
+        assert round(chi2_ppf(0.95, 4), 3) == 9.488
+
+    def test_large_df(self):
+        assert round(chi2_ppf(0.999, 1000), 2) == 1143.92
+
+    def test_very_large_df(self):
+        # The median of chi-square is about df - 2/3, so
+        # P(chi2 <= df) = 0.5 + 0.3989 * (2/3) / sqrt(2 df) to first order.
+        for df in (1e6, 1e7):
+            expected = 0.5 + 0.39894 * (2 / 3.) / np.sqrt(2 * df)
+            assert chi2_cdf(df, df) == pytest.approx(expected, abs=1e-6)
+            assert chi2_sf(df, df) == pytest.approx(1 - expected, abs=1e-6)
+        assert round(chi2_ppf(0.5, 1e6) / 1e6, 7) == 0.9999993
+
+    def test_no_convergence_warning(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            chi2_sf(np.array([1e5, 2e7]), np.array([1e5, 2e7]))
+
+    def test_warns_if_not_converged(self, monkeypatch):
+        import stats.tables.distributions as distributions
+        monkeypatch.setattr(distributions, 'MAX_ITER', 10)
+        monkeypatch.setattr(distributions, 'ITER_PER_ROOT', 0)
+        with pytest.warns(RuntimeWarning):
+            chi2_cdf(1e6, 1e6)
+
+    def test_array(self):
+        chi2 = np.array([1.0, 10.0, 100.0])
+        df = np.array([2, 10, 90])
+        p = chi2_sf(chi2, df)
+        assert np.allclose(chi2_ppf(1 - p, df), chi2)
+
+
+class TestF(object):
+    def test_ppf(self):
+        assert round(f_ppf(0.95, 1, 1), 2) == 161.45
+        assert round(f_ppf(0.99, 5, 10), 3) == 5.636
+
+    def test_infinite_df(self):
+        assert round(f_ppf(0.95, 4, np.inf), 3) == 2.372
+        assert round(f_ppf(0.95, np.inf, 10), 3) == 2.538
+        assert f_ppf(0.95, np.inf, np.inf) == 1.0
+
+    def test_array(self):
+        f = np.array([0.5, 3.0, 4.0])
+        dfn = np.array([2, 4, 10])
+        dfd = np.array([5, 30, 200])
+        p = f_cdf(f, dfn, dfd)
+        assert np.allclose(f_ppf(p, dfn, dfd), f)
+        assert np.allclose(f_sf(f, dfn, dfd), 1 - p)
+
+    def test_matches_table(self):
+        table = LoadFTable()
+        assert round(f_ppf(0.975, 7, 13), 3) == table.find_f(7, 13, 0.975)
+
+
+class TestBinomial(object):
+    def test_cdf(self):
+        # 176 / 1024
+        assert binom_cdf(3, 10, 0.5) == pytest.approx(0.171875, rel=1e-12)
+
+    def test_sf(self):
+        assert binom_sf(3, 10, 0.5) == pytest.approx(1 - 0.171875, rel=1e-12)
+
+    def test_pvalue_array(self):
+        k = np.array([0, 3, 9, 20])
+        n = np.array([5, 10, 12, 20])
+        p = np.array([0.3, 0.5, 0.5, 0.9])
+        expected = [sum(math.comb(n[i], j) * p[i]**j * (1 - p[i])**(n[i] - j)
+                        for j in range(k[i], n[i] + 1)) for i in range(4)]
+        assert np.allclose(binom_pvalue(k, n, p, rejection=1), expected, rtol=1e-12)
+
+    def test_log_factorial_grows(self):
+        assert log_factorial(170) == pytest.approx(math.lgamma(171), rel=1e-13)
+        assert log_factorial(5000) == pytest.approx(math.lgamma(5001), rel=1e-13)
+
+
+class TestAnalyticLoaders(object):
+    """ The loaders with backend='analytic' give exact values.
+    """
+    def test_normal(self):
+        table = LoadNormalTable(backend='analytic')
+        assert round(table.find_prob(1.45), 5) == 0.42647
+        assert round(table.find_z(0.475), 2) == 1.96
+
+    def test_t(self):
+        table = LoadStudentsTTable(tails=2, backend='analytic')
+        assert round(table.find_t(9, confidence=0.95), 3) == 2.262
+
+    def test_chi2(self):
+        table = LoadChi2Table(backend='analytic')
+        assert round(table.find_chi2(4, confidence=0.95), 3) == 9.488
+        assert round(1 - table.find_confidence(3.96, 4), 2) == 0.41
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            LoadNormalTable(backend='spline')
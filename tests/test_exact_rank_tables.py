@@ -0,0 +1,91 @@
+""" Verification tests for the exact rank-statistic distributions.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from stats.tables.exact_rank_tables import *
+
+
+class TestRankSum(object):
+    """ Compare with enumerating every way to pick ranks of sample 1.
+    """
+    def setup(self):
+        return np.array([sum(c) for c in itertools.combinations(range(1, 10), 4)])
+
+    def test_cdf(self):
+        sums = self.setup()
+        w = np.arange(8, 32)
+        expected = [np.mean(sums <= val) for val in w]
+        assert np.allclose(rank_sum_cdf(w, 4, 5), expected, rtol=1e-14)
+
+    def test_sf(self):
+        sums = self.setup()
+        assert rank_sum_sf(26, 4, 5) == pytest.approx(np.mean(sums >= 26))
+
+    def test_out_of_range(self):
+        assert rank_sum_cdf(5, 4, 5) == 0.0
+        assert rank_sum_sf(40, 4, 5) == 1.0 - rank_sum_cdf(40, 4, 5)
+
+    def test_pvalue(self):
+        # The smallest rank sum happens once in C(9, 4) = 126 ways.
+        assert rank_sum_pvalue(10, 4, 5) == pytest.approx(2 / 126.)
+
+    def test_size_limit(self):
+        with pytest.raises(ValueError):
+            rank_sum_pvalue(50000, 1000, 1000)
+        rank_sum_pvalue(1000, RANK_SUM_MAX_N, RANK_SUM_MAX_N)
+
+    def test_cached(self):
+        clear_exact_cache()
+        for i in range(3):
+            rank_sum_pvalue(20, 6, 7)
+        info = exact_cache_info()
+        assert info.misses == 1 and info.hits > 0
+
+
+class TestSignedRank(object):
+    """ Compare with enumerating every sign of ranks 1..8.
+    """
+    def setup(self):
+        signs = itertools.product([0, 1], repeat=8)
+        return np.array([np.dot(s, np.arange(1, 9)) for s in signs])
+
+    def test_cdf(self):
+        sums = self.setup()
+        t = np.arange(0, 37)
+        expected = [np.mean(sums <= val) for val in t]
+        assert np.allclose(signed_rank_cdf(t, 8), expected, rtol=1e-14)
+
+    def test_sf(self):
+        sums = self.setup()
+        assert signed_rank_sf(30, 8) == pytest.approx(np.mean(sums >= 30))
+
+    def test_pvalue(self):
+        # T+ = 0 happens once in 2^8 = 256 ways.
+        assert signed_rank_pvalue(0, 8) == pytest.approx(2 / 256.)
+
+    def test_size_limit(self):
+        with pytest.raises(ValueError):
+            signed_rank_pvalue(10, SIGNED_RANK_MAX_N + 1)
+
+    def test_sizes(self):
+        pvalues = signed_rank_pvalue([3, 10, 3], [8, 12, 8])
+        assert pvalues[0] == pvalues[2] == signed_rank_pvalue(3, 8)
+        assert pvalues[1] == signed_rank_pvalue(10, 12)
+
+    def test_cached(self):
+        clear_exact_cache()
+        signed_rank_pvalue(np.arange(20), 30)
+        signed_rank_pvalue(5, 30)
+        assert exact_cache_info('signed_rank').misses == 1
@@ -0,0 +1,73 @@
+""" Import-time regression tests. The packages load their classes lazily,
+so importing them should not import NumPy or pandas.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def importtime(statement):
+    """ Run `statement` in a fresh interpreter under `python -X importtime`.
+
+    Returns
+    -------
+    cumulative : dict
+        Module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        fields = line.split('|')
+        cumulative[fields[2].strip()] = int(fields[1])
+    return cumulative
+
+
+class TestLazyImports(object):
+    def test_packages_skip_numpy(self):
+        modules = importtime("import stats, stats.inferential_stats, stats.tables, "
+                             "stats.inferential_spatial_stats, stats.relationships")
+        assert 'stats' in modules
+        assert 'numpy' not in modules
+        assert 'pandas' not in modules
+
+    def test_packages_are_fast(self):
+        modules = importtime("import stats, stats.inferential_stats")
+        # Only the package modules themselves, no numerical libraries.
+        assert modules['stats'] < 50000
+
+    def test_pvalue_skips_pandas(self):
+        modules = importtime("import stats.inferential_stats.pvalue")
+        assert 'numpy' in modules
+        assert 'pandas' not in modules
+
+    def test_attribute_access(self):
+        import stats
+        from stats.inferential_stats.twosample import WilcoxonRankSum
+        assert stats.WilcoxonRankSum is WilcoxonRankSum
+        assert stats.inferential_stats.WilcoxonRankSum is WilcoxonRankSum
+
+    def test_top_level_covers_subpackages(self):
+        import stats
+        import stats.inferential_stats
+        for name in stats.inferential_stats.__all__:
+            assert name in stats.__all__
+            assert getattr(stats, name) is getattr(stats.inferential_stats, name)
+
+    def test_unknown_attribute(self):
+        import stats
+        with pytest.raises(AttributeError):
+            stats.NotAStatistic
@@ -0,0 +1,251 @@
+""" Tests for the statistical table loaders.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    "Introduction to Statistical Problem Solving in Geography",
+    J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
+
+"""
+
+import subprocess
+import sys
+import threading
+
+import numpy as np
+
+import pytest
+from stats.tables.load_table import *
+
+
+class TestTableRegistry(object):
+    """ The tables should be read once and shared.
+    """
+    def setup(self):
+        clear_table_cache()
+        return get_table('normal')
+
+    def test_shared(self):
+        table = self.setup()
+        assert get_table('normal') is table
+        assert LoadNormalTable().table is table
+
+    def test_clear(self):
+        table = self.setup()
+        clear_table_cache()
+        assert get_table('normal') is not table
+
+    def test_read_only(self):
+        table = self.setup()
+        with pytest.raises(ValueError):
+            table.values[0, 0] = 1.0
+
+    def test_frame_is_a_copy(self):
+        table = self.setup()
+        frame = table.frame
+        frame['0'] = 1.0
+        assert table.frame['0'].iloc[1] == 0.03983
+
+    def test_threads(self):
+        clear_table_cache()
+        tables = []
+        threads = [threading.Thread(target=lambda: tables.append(get_table('chi2')))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(table is tables[0] for table in tables)
+
+
+class TestLoadNormalTable(object):
+    """ Nearest-entry lookups in the normal table.
+    """
+    def setup(self):
+        return LoadNormalTable()
+
+    def test_find_prob(self):
+        table = self.setup()
+        assert table.find_prob(1.45) == 0.42647
+
+    def test_find_prob_large_z(self):
+        table = self.setup()
+        assert table.find_prob(4.5) == 0.5
+
+    def test_find_z(self):
+        table = self.setup()
+        assert round(table.find_z(0.45), 2) == 1.64
+
+    def test_find_z_two_tails(self):
+        table = self.setup()
+        assert round(table.find_z(0.95, tails=2), 2) == 1.96
+
+
+class TestLoadStudentsTTable(object):
+    """ Nearest-entry lookups in the Student's t table.
+    """
+    def setup(self):
+        return LoadStudentsTTable(tails=1)
+
+    def test_find_t(self):
+        table = self.setup()
+        assert table.find_t(9, confidence=0.95) == 1.833
+
+    def test_find_t_large_df(self):
+        table = self.setup()
+        assert table.find_t(5000, confidence=0.95) == 1.646
+
+    def test_find_confidence(self):
+        table = self.setup()
+        assert table.find_confidence(2.96, 9) == 0.495
+
+
+class TestLoadChi2Table(object):
+    """ Nearest-entry lookups in the chi-square table.
+    """
+    def setup(self):
+        return LoadChi2Table()
+
+    def test_find_chi2(self):
+        table = self.setup()
+        assert table.find_chi2(4, confidence=0.95) == 9.488
+
+    def test_find_confidence_skips_missing(self):
+        table = self.setup()
+        # Row 119 has no entries for the middle columns.
+        assert round(table.find_confidence(108, 119), 3) == 0.025
+
+
+class TestLoadFTable(object):
+    """ Nearest-entry lookups in the F tables.
+    """
+    def setup(self):
+        return LoadFTable()
+
+    def test_find_f(self):
+        table = self.setup()
+        assert table.find_f(3, 20, confidence=0.95) == 3.098
+
+    def test_find_f_large_df(self):
+        table = self.setup()
+        # The nearest row to dfd 5000 is dfd 120, not INF.
+        assert table.find_f(3, 5000, confidence=0.99) == 3.949
+
+    def test_find_confidence(self):
+        table = self.setup()
+        assert round(table.find_confidence(3.1, 3, 20), 2) == 0.95
+
+    def test_array(self):
+        table = self.setup()
+        f = np.array([1.0, 3.0, 100.0])
+        dfn = np.array([3, 5, 2])
+        dfd = np.array([20, 25, 3])
+        conf = table.find_confidence_array(f, dfn, dfd)
+        assert list(conf) == [table.find_confidence(f[i], dfn[i], dfd[i])
+                              for i in range(3)]
+
+    def test_interpolate(self):
+        table = LoadFTable(interpolate=True)
+        # Interpolated in 1/df between dfd 30 (2.922) and dfd 40 (2.839).
+        assert 2.839 < table.find_f(3, 35) < 2.922
+
+
+class TestArrayLookups(object):
+    """ Array lookups should agree with the scalar lookups element-wise.
+    """
+    def test_find_prob_array(self):
+        table = LoadNormalTable()
+        z = np.array([0.33, 1.45, 2.41, 4.5])
+        probs = table.find_prob_array(z)
+        assert list(probs) == [table.find_prob(val) for val in z]
+
+    def test_find_z_array(self):
+        table = LoadNormalTable()
+        probs = np.array([0.1, 0.45, 0.49])
+        z = table.find_z_array(probs)
+        assert list(z) == [table.find_z(val) for val in probs]
+
+    def test_find_t_array(self):
+        table = LoadStudentsTTable(tails=1)
+        df = np.array([[5], [9], [500]])
+        t = table.find_t_array(df, [0.9, 0.95])
+        assert t.shape == (3, 2)
+        assert t[1, 1] == table.find_t(9, 0.95)
+
+    def test_t_find_confidence_array(self):
+        table = LoadStudentsTTable(tails=1)
+        t = np.array([0.5, 2.96, 7.0])
+        df = np.array([3, 9, 40])
+        conf = table.find_confidence_array(t, df)
+        assert list(conf) == [table.find_confidence(t[i], df[i]) for i in range(3)]
+
+    def test_chi2_find_confidence_array(self):
+        table = LoadChi2Table()
+        chi2 = np.array([3.96, 108.0, 20.0])
+        conf = table.find_confidence_array(chi2, [4, 119, 19])
+        assert list(conf) == [table.find_confidence(3.96, 4),
+            table.find_confidence(108.0, 119), table.find_confidence(20.0, 19)]
+
+
+class TestInterpolation(object):
+    """ interpolate=True interpolates linearly between table entries.
+    """
+    def test_find_prob(self):
+        table = LoadNormalTable(interpolate=True)
+        # Half-way between 1.45 (0.42647) and 1.46 (0.42785).
+        assert round(table.find_prob(1.455), 5) == 0.42716
+
+    def test_find_prob_on_grid(self):
+        table = LoadNormalTable(interpolate=True)
+        assert round(table.find_prob(1.45), 6) == 0.42647
+
+    def test_find_chi2_between_df(self):
+        table = LoadChi2Table(interpolate=True)
+        # Half-way between df 4 (9.488) and df 5 (11.07).
+        assert round(table.find_chi2(4.5, confidence=0.95), 3) == 10.279
+
+    def test_find_t_toward_infinity(self):
+        table = LoadStudentsTTable(tails=1, interpolate=True)
+        # Interpolated in 1/df between df 1000 (1.646) and INF (1.645).
+        assert round(table.find_t(5000, confidence=0.95), 4) == 1.6452
+
+    def test_find_confidence_between_columns(self):
+        table = LoadChi2Table(interpolate=True)
+        # 3.96 lies between 3.36 (0.5) and 5.39 (0.25) at df 4.
+        conf = table.find_confidence(3.96, 4)
+        assert 0.5 < conf < 0.75
+
+    def test_array(self):
+        table = LoadStudentsTTable(tails=1, interpolate=True)
+        t = np.array([1.0, 2.0, 2.96])
+        df = np.array([4.5, 9, 9])
+        conf = table.find_confidence_array(t, df)
+        assert list(conf) == [table.find_confidence(t[i], df[i]) for i in range(3)]
+
+
+class TestCompiledTables(object):
+    """ The compiled .npy tables should match the CSVs they came from.
+    """
+    def test_same_as_csv(self):
+        for name in TABLE_FILES:
+            csv_table = read_csv_table(name)
+            compiled_table = read_compiled_table(name)
+            assert compiled_table.columns == csv_table.columns
+            assert np.array_equal(compiled_table.values, csv_table.values,
+                                  equal_nan=True)
+            assert np.array_equal(compiled_table.index,
+                                  np.asarray(csv_table.index, dtype=float))
+
+    def test_no_pandas(self):
+        code = ("import sys; from stats.inferential_stats.pvalue import PValue; "
+                "PValue(1.45, 85); PValue(2.96, 10); "
+                "PValue(3.96, 5, chi_square=True); "
+                "assert 'pandas' not in sys.modules")
+        subprocess.check_call([sys.executable, '-c', code])
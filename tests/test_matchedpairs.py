@@ -15,6 +15,7 @@ References:
 
 """
 
+import numpy as np
 import pytest
 from stats.inferential_stats.matchedpairs import *
 
@@ -42,6 +43,40 @@ class TestTTest(object):
         val = round(ttest.test_stat, 2)
         assert val == 5.55  # book said 2.96, but math doesn't work
 
+class TestTTestFromPairs(object):
+    """ Differences of both signs, streamed in chunks.
+    """
+    def setup(self):
+        rng = np.random.RandomState(6)
+        x = rng.normal(10.0, 1.0, 1000)
+        y = x + rng.normal(-0.1, 0.5, 1000)
+        return x, y
+
+    def test_signed_differences(self):
+        x, y = self.setup()
+        ttest = TTest(1000, x, y)
+        d = x - y
+        assert np.isclose(ttest.sigma, d.std(ddof=1) / np.sqrt(1000))
+        assert np.isclose(ttest.d, abs(d.mean()))
+
+    def test_chunks(self):
+        x, y = self.setup()
+        ttest = TTest(1000, x, y)
+        chunked = TTest.from_pairs(x, y, chunk_size=64)
+        assert chunked.n == 1000
+        assert np.isclose(chunked.test_stat, ttest.test_stat)
+
+    def test_generators(self):
+        x, y = self.setup()
+        ttest = TTest.from_pairs((x[i:i + 100] for i in range(0, 1000, 100)),
+                                 iter(y.tolist()), chunk_size=100)
+        assert np.isclose(ttest.test_stat, TTest(1000, x, y).test_stat)
+
+    def test_unpaired(self):
+        x, y = self.setup()
+        with pytest.raises(ValueError):
+            TTest.from_pairs(x, y[:-1])
+
 class TestWilcoxonSignedRanks(object):
    def setup(self):
        Tp = 19
@@ -57,3 +92,35 @@ class TestWilcoxonSignedRanks(object):
        Zwtest = self.setup()
        val = round(Zwtest.test_stat, 2)
        assert val == -1.24
+
+class TestWilcoxonSignedRanksFromPairs(object):
+    def setup(self):
+        x = [5.2, 5.3, 5.8, 4.1, 4.8, 5.2, 4.7, 4.9, 4.9, 4.5, 6.0]
+        y = [5.8, 5.8, 5.8, 6.7, 6.7, 4.9, 7.0, 5.8, 7.4, 5.1, 5.5]
+        return WilcoxonSignedRanks.from_pairs(x, y)
+
+    def test_rank_sums(self):
+        # Differences -0.6, -0.5, 0 (dropped), -2.6, -1.9, 0.3, -2.3, -0.9,
+        # -2.5, -0.6, 0.5: the two -0.6 and the two 0.5 are tied.
+        wtest = self.setup()
+        assert wtest.n == 10
+        assert wtest.Tp == 1 + 2.5
+        assert wtest.Tn == 55 - 3.5
+        assert wtest.ties == 12.0
+        assert wtest.Zw is None
+
+    def test_exact(self):
+        wtest = self.setup()
+        # Ties: the normal approximation unless asked.
+        assert wtest.pvalue(exact=True) == pytest.approx(
+            2 * np.mean([np.dot(s, np.arange(1, 11)) <= 3 for s in
+                         np.ndindex(*(2,) * 10)]))
+        assert wtest.pvalue(rejection=-1) < 0.05 < wtest.pvalue(rejection=1)
+
+    def test_normal_close_to_exact(self):
+        rng = np.random.RandomState(7)
+        x = rng.normal(0.3, 1.0, 40)
+        wtest = WilcoxonSignedRanks.from_pairs(x, np.zeros(40))
+        exact = wtest.pvalue(exact=True)
+        normal = wtest.pvalue(exact=False, backend='analytic')
+        assert abs(exact - normal) < 0.01
@@ -53,6 +53,19 @@ class TestANOVA(object):
         val = round(Ftest.MS_W, 1)
         assert val == 10.1
 
+    def test_F_ratio(self):
+        Ftest = self.setup()
+        val = round(Ftest.F, 1)
+        assert val == 22.5
+
+    def test_df(self):
+        Ftest = self.setup()
+        assert (Ftest.dfn, Ftest.dfd) == (3, 196)
+
+    def test_pvalue(self):
+        Ftest = self.setup()
+        assert Ftest.pvalue(backend='analytic') < 0.001
+
 class TestKruskalWallis(object):
     """ Uses tables 11.3 - 11.4.
     """
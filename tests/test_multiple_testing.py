@@ -0,0 +1,75 @@
+""" Verification tests for the multiple-testing corrections.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import numpy as np
+import pytest
+from stats.inferential_stats.multiple_testing import *
+
+
+class TestInMemory(object):
+    def setup(self):
+        return np.array([0.01, 0.04, 0.03, 0.005])
+
+    def test_bonferroni(self):
+        adjusted, reject = bonferroni(self.setup())
+        assert list(np.round(adjusted, 3)) == [0.04, 0.16, 0.12, 0.02]
+        assert list(reject) == [True, False, False, True]
+
+    def test_holm(self):
+        adjusted, reject = holm(self.setup())
+        assert list(np.round(adjusted, 3)) == [0.03, 0.06, 0.06, 0.02]
+        assert list(reject) == [True, False, False, True]
+
+    def test_benjamini_hochberg(self):
+        adjusted, reject = benjamini_hochberg(self.setup())
+        assert list(np.round(adjusted, 3)) == [0.02, 0.04, 0.04, 0.02]
+        assert list(reject) == [True, True, True, True]
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            correct(self.setup(), method='sidak')
+
+
+class TestChunkedCorrection(object):
+    """ Chunked rejections should match the in-memory ones.
+    """
+    def setup(self):
+        rng = np.random.RandomState(0)
+        pvalues = rng.uniform(size=20000)
+        pvalues[:2000] = rng.uniform(size=2000) ** 8
+        pvalues[:50] = 0.0
+        return pvalues
+
+    def test_matches_in_memory(self):
+        pvalues = self.setup()
+        chunks = np.array_split(pvalues, 7)
+        for method in METHODS:
+            adjusted, reject = correct(pvalues, method)
+            for bins in (16, 4096):
+                chunked = ChunkedCorrection(chunks, method, bins=bins)
+                assert chunked.n_rejected == reject.sum()
+                assert np.array_equal(np.concatenate(list(chunked.reject())), reject)
+
+    def test_function(self):
+        pvalues = self.setup()
+        chunked = ChunkedCorrection(lambda: iter(np.array_split(pvalues, 3)))
+        assert chunked.m == pvalues.size
+
+    def test_one_shot_iterator(self):
+        with pytest.raises(ValueError):
+            ChunkedCorrection(iter([self.setup()]))
+
+    def test_adjust_bonferroni(self):
+        pvalues = self.setup()
+        chunked = ChunkedCorrection([pvalues[:100], pvalues[100:]], 'bonferroni')
+        adjusted = np.concatenate(list(chunked.adjust()))
+        assert np.array_equal(adjusted, bonferroni(pvalues)[0])
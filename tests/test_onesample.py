@@ -0,0 +1,201 @@
+""" Verification tests for the one-sample tests.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+References:
+
+    "Introduction to Statistical Problem Solving in Geography",
+    J.C. McGrew, Jr., A.J. Lembo, Jr., C.B. Monroe
+
+"""
+
+import numpy as np
+import pytest
+from stats.inferential_stats.moments import *
+from stats.inferential_stats.onesample import *
+
+
+class TestRunningMoments(object):
+    def setup(self):
+        rng = np.random.RandomState(0)
+        return rng.normal(1e6, 3.0, size=10001)
+
+    def test_array(self):
+        data = self.setup()
+        moments = RunningMoments.from_data(data, chunk_size=1000)
+        assert moments.n == data.size
+        assert np.isclose(moments.mean, data.mean(), rtol=1e-14)
+        assert np.isclose(moments.variance(), data.var(ddof=1), rtol=1e-10)
+
+    def test_generator_of_chunks(self):
+        data = self.setup()
+        chunks = (data[i:i + 777] for i in range(0, data.size, 777))
+        moments = RunningMoments.from_data(chunks)
+        assert np.isclose(moments.stddev(ddof=0), data.std(), rtol=1e-10)
+
+    def test_iterable_of_floats(self):
+        moments = RunningMoments.from_data(iter([2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]),
+                                           chunk_size=3)
+        assert moments.mean == 5.0
+        assert moments.stddev(ddof=0) == 2.0
+
+    def test_merge(self):
+        data = self.setup()
+        left = RunningMoments.from_data(data[:10])
+        left.merge(RunningMoments.from_data(data[10:]))
+        assert np.isclose(left.variance(), data.var(ddof=1), rtol=1e-10)
+
+
+class TestOneSampleDifferenceMeans(object):
+    def setup(self):
+        return OneSampleDifferenceMeans(hyp_mean=50, mean=53, n=40, stddev=8,
+                                        rejection=2)
+
+    def test_test_stat(self):
+        test = self.setup()
+        assert round(test.test_stat, 2) == 2.37
+
+    def test_pvalue(self):
+        test = self.setup()
+        assert round(test.pvalue, 4) == 0.0178
+
+    def test_from_samples(self):
+        data = np.array([48., 55., 51., 60., 52., 49., 58., 53., 56., 50.])
+        test = OneSampleDifferenceMeans.from_samples(50, iter(data))
+        expected = OneSampleDifferenceMeans(50, data.mean(), data.size,
+                                            data.std(), 1)
+        assert test.n == 10
+        assert test.test_stat == expected.test_stat
+        assert test.pvalue == expected.pvalue
+
+
+class TestOneSampleDifferenceProportions(object):
+    def test_test_stat(self):
+        test = OneSampleDifferenceProportions(hyp_prop=0.5, prop=0.6, n=100)
+        assert round(test.test_stat, 2) == 2.0
+
+    def test_from_samples(self):
+        data = np.array([1] * 60 + [0] * 40)
+        test = OneSampleDifferenceProportions.from_samples(0.5, data)
+        assert round(test.test_stat, 2) == 2.0
+
+
+class TestGroupedOneSample(object):
+    """ Grouped tests should match one test per group.
+    """
+    def setup(self):
+        rng = np.random.RandomState(1)
+        groups = rng.randint(0, 4, size=300)
+        # A small group, tested with t.
+        groups[:12] = 4
+        values = rng.normal(10.0, 2.0, size=300) + groups
+        return values, groups
+
+    def test_means(self):
+        values, groups = self.setup()
+        grouped = GroupedOneSampleDifferenceMeans(11.0, values, groups, rejection=2)
+        for g in range(5):
+            data = values[groups == g]
+            test = OneSampleDifferenceMeans.from_samples(11.0, data, rejection=2)
+            assert grouped.n[g] == test.n
+            assert np.isclose(abs(grouped.test_stat[g]), test.test_stat)
+            assert np.isclose(grouped.pvalue[g], test.pvalue)
+
+    def test_empty_and_single_groups(self):
+        values, groups = self.setup()
+        # Group 5 has one unit and group 6 none.
+        values = np.append(values, 13.0)
+        groups = np.append(groups, 5)
+        means = GroupedOneSampleDifferenceMeans(11.0, values, groups, rejection=2,
+                                                ngroups=7)
+        binary = (values > 12).astype(int)
+        props = GroupedOneSampleDifferenceProportions(0.5, binary, groups,
+                                                      rejection=2, ngroups=7)
+        exact = GroupedOneSampleDifferenceProportions(0.5, binary, groups,
+                                                      rejection=2, ngroups=7,
+                                                      exact=True)
+        for grouped in (means, props):
+            assert np.all(np.isnan(grouped.pvalue[5:]))
+            assert np.all(np.isfinite(grouped.pvalue[:5]))
+        assert np.isnan(exact.pvalue[6]) and exact.pvalue[5] == 1.0
+
+    def test_proportions(self):
+        values, groups = self.setup()
+        binary = (values > 12).astype(int)
+        for rejection in (2, 1, -1):
+            grouped = GroupedOneSampleDifferenceProportions(0.5, binary, groups,
+                                                            rejection=rejection)
+            for g in range(5):
+                test = OneSampleDifferenceProportions.from_samples(0.5,
+                    binary[groups == g], rejection=rejection)
+                assert np.isclose(abs(grouped.test_stat[g]), test.test_stat)
+                assert np.isclose(grouped.pvalue[g], test.pvalue)
+
+    def test_directional(self):
+        values, groups = self.setup()
+        # Group 0 lies below the hypothesized mean and group 3 above it.
+        upper = GroupedOneSampleDifferenceMeans(11.0, values, groups, rejection=1)
+        lower = GroupedOneSampleDifferenceMeans(11.0, values, groups, rejection=-1)
+        assert upper.test_stat[0] < 0 < upper.test_stat[3]
+        assert upper.pvalue[0] > 0.99 and upper.pvalue[3] < 0.01
+        assert lower.pvalue[0] < 0.01 and lower.pvalue[3] > 0.99
+        assert np.allclose(upper.pvalue[:4] + lower.pvalue[:4], 1.0)
+        binary = (values > 12).astype(int)
+        props = GroupedOneSampleDifferenceProportions(0.5, binary, groups,
+                                                      rejection=1)
+        assert props.test_stat[0] < 0 < props.test_stat[3]
+        assert props.pvalue[0] > 0.5 > props.pvalue[3]
+
+
+class TestExactBinomial(object):
+    """ 9 successes in 12 trials against p = 0.5.
+    """
+    def test_one_tail(self):
+        test = OneSampleDifferenceProportions(0.5, 9 / 12., 12, exact=True)
+        assert round(test.pvalue, 4) == 0.073
+
+    def test_two_tail(self):
+        test = OneSampleDifferenceProportions(0.5, 9 / 12., 12, rejection=2,
+                                              exact=True)
+        assert round(test.pvalue, 4) == 0.146
+
+    def test_grouped(self):
+        values = np.array([1] * 9 + [0] * 3 + [1] * 2 + [0] * 8)
+        groups = np.array([0] * 12 + [1] * 10)
+        grouped = GroupedOneSampleDifferenceProportions(0.5, values, groups,
+                                                        rejection=2, exact=True)
+        assert list(grouped.successes) == [9, 2]
+        assert round(grouped.pvalue[0], 4) == 0.146
+        assert round(grouped.pvalue[1], 4) == 0.1094
+
+    def test_grouped_rejections(self):
+        values = np.array([1] * 9 + [0] * 3 + [1] * 2 + [0] * 8 + [1] * 2 + [0] * 8)
+        groups = np.array([0] * 12 + [1] * 10 + [2] * 10)
+        grouped = GroupedOneSampleDifferenceProportions(0.5, values, groups,
+            rejection=np.array([2, 1, -1]), exact=True)
+        assert round(grouped.pvalue[0], 4) == 0.146
+        # P(X >= 2) and P(X <= 2) for 10 trials.
+        assert round(grouped.pvalue[1], 4) == 0.9893
+        assert round(grouped.pvalue[2], 4) == 0.0547
+
+    def test_modes_agree_on_direction(self):
+        # 4 successes in 20 trials lies below p = 0.5.
+        for rejection in (1, -1):
+            normal = OneSampleDifferenceProportions(0.5, 0.2, 20, rejection=rejection)
+            exact = OneSampleDifferenceProportions(0.5, 0.2, 20, rejection=rejection,
+                                                   exact=True)
+            assert (normal.pvalue > 0.5) == (exact.pvalue > 0.5)
+        assert OneSampleDifferenceProportions(0.5, 0.2, 20, rejection=1).pvalue > 0.99
+        values = np.array([1] * 4 + [0] * 16 + [1] * 16 + [0] * 4)
+        groups = np.array([0] * 20 + [1] * 20)
+        normal = GroupedOneSampleDifferenceProportions(0.5, values, groups)
+        exact = GroupedOneSampleDifferenceProportions(0.5, values, groups,
+                                                      exact=True)
+        assert normal.pvalue[0] > 0.99 and exact.pvalue[0] > 0.99
+        assert normal.pvalue[1] < 0.01 and exact.pvalue[1] < 0.01
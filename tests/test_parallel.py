@@ -0,0 +1,52 @@
+""" Verification tests for the blocked process-pool helpers.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import numpy as np
+from stats.inferential_stats.parallel import *
+
+
+def draw(state, size, seed):
+    return np.random.default_rng(seed).normal(state, 1.0, size)
+
+
+class TestBlockSizes(object):
+    def test_remainder(self):
+        assert block_sizes(10, 4) == [4, 4, 2]
+
+    def test_even(self):
+        assert block_sizes(8, 4) == [4, 4]
+
+
+class TestSpawnSeeds(object):
+    def test_reproducible(self):
+        first = [np.random.default_rng(s).random() for s in spawn_seeds(3, 4)]
+        second = [np.random.default_rng(s).random() for s in spawn_seeds(3, 4)]
+        assert first == second
+        assert len(set(first)) == 4
+
+
+class TestMapBlocks(object):
+    def test_serial(self):
+        blocks = list(map_blocks(draw, 5.0, 10, 4, seed=1))
+        assert [block.size for block in blocks] == [4, 4, 2]
+
+    def test_workers_match_serial(self):
+        serial = np.concatenate(list(map_blocks(draw, 5.0, 100, 30, seed=2)))
+        pooled = np.concatenate(list(map_blocks(draw, 5.0, 100, 30, seed=2,
+                                                workers=2)))
+        assert np.array_equal(serial, pooled)
+
+    def test_close_early(self):
+        blocks = map_blocks(draw, 5.0, 1000, 10, seed=3, workers=2)
+        first = next(blocks)
+        blocks.close()
+        assert first.size == 10
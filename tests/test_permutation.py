@@ -0,0 +1,81 @@
+""" Verification tests for the permutation tests.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from stats.inferential_stats.permutation import *
+from stats.inferential_stats.twosample import WilcoxonRankSum, ZTest
+
+
+def median_difference(x1, x2):
+    return np.median(x1, axis=-1) - np.median(x2, axis=-1)
+
+
+class TestPermutationTest(object):
+    def setup(self):
+        rng = np.random.default_rng(1)
+        return rng.normal(0, 1, 20), rng.normal(0.3, 1, 25)
+
+    def test_observed(self):
+        x1, x2 = self.setup()
+        ttest = PermutationTest(x1, x2, 't', n_permutations=10)
+        assert ttest.observed == pytest.approx(ZTest.from_samples(x1, x2).t)
+        wtest = PermutationTest(x1, x2, 'rank_sum', n_permutations=10)
+        assert wtest.observed == pytest.approx(WilcoxonRankSum.from_samples(x1, x2).Zw)
+
+    def test_close_to_t_test(self):
+        x1, x2 = self.setup()
+        test = PermutationTest(x1, x2, 't', early_stop=False, seed=3)
+        lower, upper = test.interval
+        assert lower < ZTest.from_samples(x1, x2).pvalue(backend='analytic') < upper
+
+    def test_exact(self):
+        # Enumerate every split of 4 + 4 values.
+        x1, x2 = np.array([1.0, 2.5, 3.0, 4.2]), np.array([3.9, 5.1, 6.0, 7.4])
+        pooled = np.concatenate([x1, x2])
+        observed = x1.mean() - x2.mean()
+        splits = [pooled[list(c)].mean() - np.delete(pooled, c).mean()
+                  for c in itertools.combinations(range(8), 4)]
+        expected = np.mean(np.abs(splits) >= abs(observed) - 1e-12)
+        test = PermutationTest(x1, x2, n_permutations=100000, early_stop=False,
+                               seed=0)
+        assert round(test.count / float(test.n_permutations), 2) == round(expected, 2)
+
+    def test_custom_statistic(self):
+        x1, x2 = self.setup()
+        test = PermutationTest(x1, x2 + 3, median_difference, rejection=-1, seed=0)
+        assert test.observed < 0
+        assert test.pvalue < 0.05
+
+    def test_early_stop(self):
+        x1, x2 = self.setup()
+        test = PermutationTest(x1, x2 + 2, block_size=100, n_permutations=10000,
+                               seed=0)
+        assert test.stopped_early
+        assert test.n_permutations < 10000
+        assert test.interval[1] < 0.05
+
+    def test_reproducible(self):
+        x1, x2 = self.setup()
+        serial = PermutationTest(x1, x2, n_permutations=2000, block_size=250,
+                                 early_stop=False, seed=7)
+        pooled = PermutationTest(x1, x2, n_permutations=2000, block_size=250,
+                                 early_stop=False, seed=7, workers=2)
+        assert serial.count == pooled.count
+        assert serial.n_permutations == pooled.n_permutations == 2000
+
+    def test_bad_statistic(self):
+        x1, x2 = self.setup()
+        with pytest.raises(ValueError):
+            PermutationTest(x1, x2, 'median')
@@ -15,8 +15,10 @@ References:
 
 """
 
+import numpy as np
 import pytest
 from stats.inferential_stats.pvalue import *
+from stats.tables.load_table import _registry, clear_table_cache
 
 
 class TestPValueNormalTable(object):
@@ -66,3 +68,102 @@ class TestPValueStudentsTTable(object):
         assert pvalue == 0.01
 
 
+class TestPValueAnalytic(object):
+    """ Exact p-values from the analytic backend.
+    """
+    def test_normal(self):
+        test = PValue(1.45, 85, 1, backend='analytic')
+        assert round(test.pvalue, 4) == 0.0735
+
+    def test_students_t(self):
+        test = PValue(2.96, 10, 1, backend='analytic')
+        assert round(test.pvalue, 3) == 0.008
+
+    def test_chi_square(self):
+        test = PValue(test_stat=3.96, n=5, chi_square=True, backend='analytic')
+        assert round(test.pvalue, 2) == 0.41
+
+class TestPValueFTable(object):
+    """ Uses the ANOVA of table 11.1, F = 22.5 with 3 and 196 df.
+    """
+    def test_table(self):
+        test = PValue(22.5, 200, f_test=True, k=4)
+        assert round(test.pvalue, 3) == 0.001
+
+    def test_analytic(self):
+        test = PValue(2.65, 200, f_test=True, k=4, backend='analytic')
+        assert round(test.pvalue, 2) == 0.05
+
+
+class TestPValueInterpolated(object):
+    """ Interpolated table lookups.
+    """
+    def test_normal(self):
+        test = PValue(1.455, 85, 1, interpolate=True)
+        assert round(test.pvalue, 5) == 0.07284
+
+
+
+class TestPValueBatch(object):
+    """ The batch should agree with PValue test by test.
+    """
+    def setup(self):
+        test_stats = np.array([1.45, -1.245, 2.96, 3.96, 22.5])
+        ns = np.array([85, 11, 10, 5, 200])
+        rejections = np.array([1, 1, 2, 1, 1])
+        chi_square = np.array([False, False, False, True, False])
+        f_test = np.array([False, False, False, False, True])
+        return PValueBatch(test_stats, ns, rejections, chi_square,
+                           f_test=f_test, k=4)
+
+    def test_groups(self):
+        batch = self.setup()
+        assert list(batch.normal_mask) == [True, False, False, False, False]
+        assert list(batch.t_mask) == [False, True, True, False, False]
+        assert list(batch.chi_square_mask) == [False, False, False, True, False]
+
+    def test_pvalues(self):
+        batch = self.setup()
+        expected = [PValue(1.45, 85, 1).pvalue,
+                    PValue(-1.245, 11, 1).pvalue,
+                    PValue(2.96, 10, 2).pvalue,
+                    PValue(3.96, 5, chi_square=True).pvalue,
+                    PValue(22.5, 200, f_test=True, k=4).pvalue]
+        assert list(batch.pvalue) == expected
+
+    def test_negative_rejection(self):
+        batch = PValueBatch([-1.45], [85], rejections=-1)
+        assert round(batch.pvalue[0], 4) == 0.0735
+
+    def test_not_finite(self):
+        batch = PValueBatch([np.nan, 1.45, np.nan], [50, 85, 10], rejections=2)
+        assert np.isnan(batch.pvalue[0]) and np.isnan(batch.pvalue[2])
+        assert batch.pvalue[1] == PValue(1.45, 85, 2).pvalue
+
+    def test_directional(self):
+        batch = PValueBatch([1.45, -1.45, -1.45], [85, 85, 85],
+                            rejections=[1, 1, -1], directional=True)
+        assert round(batch.pvalue[0], 4) == 0.0735
+        assert round(batch.pvalue[1], 4) == 0.9265
+        assert batch.pvalue[2] == batch.pvalue[0]
+
+
+class TestPValueLazy(object):
+    """ Nothing should be looked up until the p-value is read.
+    """
+    def test_no_lookup(self):
+        clear_table_cache()
+        test = PValue(1.45, 85, 1)
+        assert 'normal' not in _registry
+        assert round(test.pvalue, 4) == 0.0735
+        assert 'normal' in _registry
+
+    def test_cached(self):
+        test = PValue(2.96, 10, 1)
+        assert test.area is test.area
+        assert test.pvalue == test.pvalue
+
+    def test_slots(self):
+        test = PValue(2.96, 10, 1)
+        with pytest.raises(AttributeError):
+            test.other = 1
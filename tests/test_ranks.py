@@ -0,0 +1,34 @@
+""" Verification tests for ranking with ties.
+
+Author:
+
+    C.M. Gosmeyer
+
+Date:
+
+    Mar 2018
+
+"""
+
+import numpy as np
+import pytest
+from stats.inferential_stats.ranks import *
+
+
+class TestRankWithTies(object):
+    def setup(self):
+        return rank_with_ties([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0])
+
+    def test_ranks(self):
+        ranks, tie_counts = self.setup()
+        assert list(ranks) == [4.0, 1.5, 5.0, 1.5, 6.5, 9.0, 3.0, 8.0, 6.5]
+
+    def test_tie_counts(self):
+        ranks, tie_counts = self.setup()
+        assert sorted(tie_counts) == [1, 1, 1, 1, 1, 2, 2]
+        assert tie_correction(tie_counts) == 12.0
+
+    def test_no_ties(self):
+        ranks, tie_counts = rank_with_ties(np.array([0.3, 0.1, 0.2]))
+        assert list(ranks) == [3.0, 1.0, 2.0]
+        assert tie_correction(tie_counts) == 0.0
@@ -15,8 +15,11 @@ References:
 
 """
 
+import numpy as np
 import pytest
+from stats.inferential_stats.pvalue import PValue
 from stats.inferential_stats.twosample import *
+from stats.tables.distributions import t_sf
 
 class TestZTest(object):
     """ Uses table 10.1.
@@ -38,6 +41,35 @@ class TestZTest(object):
         val = round(ztest.test_stat, 2)
         assert val == 0.44
 
+class TestZTestFromSamples(object):
+    def setup(self):
+        rng = np.random.RandomState(2)
+        return rng.normal(52., 8., size=15), rng.normal(51., 16., size=45)
+
+    def test_matches_summary(self):
+        x1, x2 = self.setup()
+        ztest = ZTest.from_samples(x1, x2)
+        expected = ZTest(15, 45, x1.mean(), x2.mean(), x1.std(ddof=1), x2.std(ddof=1))
+        assert ztest.n1 == 15 and ztest.n2 == 45
+        assert np.isclose(ztest.test_stat, expected.test_stat)
+
+    def test_chunks(self):
+        x1, x2 = self.setup()
+        chunks1 = (x1[i:i + 4] for i in range(0, 15, 4))
+        chunks2 = (x2[i:i + 4] for i in range(0, 45, 4))
+        ztest = ZTest.from_samples(chunks1, chunks2)
+        assert np.isclose(ztest.test_stat, ZTest.from_samples(x1, x2).test_stat)
+
+    def test_large_samples(self):
+        rng = np.random.RandomState(3)
+        ztest = ZTest.from_samples(rng.normal(size=100), rng.normal(size=200))
+        assert ztest.Z is not None and ztest.t is None
+
+    def test_equal_variances(self):
+        # Pooled variance estimate, which used to raise a NameError.
+        ztest = ZTest(15, 45, 52.6, 51.2, 10.0, 10.0)
+        assert round(ztest.sigma_x1subx2, 2) == 2.98
+
 class TestWilcoxonRankSum(object):
     """ Uses table 10.2.
     """
@@ -82,3 +114,177 @@ class TestDiffOfProportions(object):
         ptest = self.setup()
         val = round(ptest.test_stat, 2)
         assert val == 7.88     
+
+
+class TestZTestBatch(object):
+    """ Each column should match a ZTest on that column.
+    """
+    def setup(self, n1=15, n2=45):
+        rng = np.random.RandomState(4)
+        x1 = rng.normal(10.0, 2.0, size=(n1, 6))
+        x2 = rng.normal(10.5, 3.0, size=(n2, 6))
+        return x1, x2
+
+    def test_small_samples(self):
+        x1, x2 = self.setup()
+        batch = ZTestBatch(x1, x2)
+        for j in range(6):
+            ztest = ZTest.from_samples(x1[:, j], x2[:, j])
+            assert np.isclose(batch.test_stat[j], ztest.test_stat)
+            assert np.isclose(batch.sigma_x1subx2[j], ztest.sigma_x1subx2)
+        assert list(batch.df) == [14] * 6
+
+    def test_large_samples(self):
+        x1, x2 = self.setup(40, 60)
+        batch = ZTestBatch(x1, x2, sigma1=2.0, sigma2=3.0)
+        ztest = ZTest.from_samples(x1[:, 0], x2[:, 0], sigma1=2.0, sigma2=3.0)
+        assert np.isclose(batch.test_stat[0], ztest.Z)
+        assert batch.pvalue.shape == (6,)
+
+    def test_pvalue(self):
+        x1, x2 = self.setup()
+        batch = ZTestBatch(x1, x2, rejection=2)
+        expected = PValue(batch.test_stat[0], 15, 2).pvalue
+        assert batch.pvalue[0] == expected
+
+    def test_directional(self):
+        batch = ZTestBatch.from_summary([10, 10], [12, 12], [10.0, 11.0],
+                                        [11.0, 10.0], 2.0, 2.0, rejection=1,
+                                        backend='analytic')
+        assert batch.test_stat[0] < 0 < batch.test_stat[1]
+        assert batch.pvalue[0] > 0.5 and batch.pvalue[1] < 0.5
+        assert np.isclose(batch.pvalue[0] + batch.pvalue[1], 1.0)
+        single = ZTest(10, 12, 11.0, 10.0, 2.0, 2.0)
+        assert np.isclose(batch.pvalue[1], single.pvalue(1, backend='analytic'))
+
+
+class TestDiffOfProportionsBatch(object):
+    def test_matches_single(self):
+        rng = np.random.RandomState(5)
+        x1 = rng.uniform(size=(200, 4)) < 0.3
+        x2 = rng.uniform(size=(300, 4)) < 0.4
+        batch = DiffOfProportionsBatch(x1, x2)
+        for j in range(4):
+            ptest = DiffOfProportions(200, 300, x1[:, j].mean(), x2[:, j].mean())
+            assert np.isclose(abs(batch.test_stat[j]), ptest.test_stat)
+        assert np.all(batch.pvalue >= 0)
+
+    def test_from_counts(self):
+        successes1 = np.array([516, 30, 0, 50])
+        trials1 = np.array([2156, 100, 40, 100])
+        successes2 = np.array([2388, 50, 0, 30])
+        trials2 = np.array([7269, 100, 60, 100])
+        batch = DiffOfProportionsBatch.from_counts(successes1, trials1,
+                                                   successes2, trials2)
+        ptest = DiffOfProportions(2156, 7269, 516 / 2156., 2388 / 7269.)
+        assert np.isclose(batch.test_stat[0], -ptest.test_stat)
+        assert np.isclose(batch.pooled_estimate[0], ptest.pooled_estimate)
+        # Two groups with no successes cannot differ.
+        assert batch.test_stat[2] == 0.0
+        assert batch.pvalue[1] == batch.pvalue[3]
+
+    def test_empty_segments(self):
+        batch = DiffOfProportionsBatch.from_counts([0, 3, 0], [0, 10, 10],
+                                                   [5, 5, 0], [10, 0, 10])
+        assert np.isnan(batch.test_stat[0]) and np.isnan(batch.test_stat[1])
+        assert np.isnan(batch.pvalue[0]) and np.isnan(batch.pvalue[1])
+        # All failures in both groups: no difference.
+        assert batch.test_stat[2] == 0.0
+
+    def test_directional(self):
+        batch = DiffOfProportionsBatch.from_counts([30, 50], 100, [50, 30], 100,
+                                                   rejection=1, backend='analytic')
+        assert batch.pvalue[0] > 0.5 and batch.pvalue[1] < 0.5
+        assert np.isclose(batch.pvalue[0] + batch.pvalue[1], 1.0)
+
+
+class TestWelch(object):
+    def setup(self):
+        return ZTest(10, 20, 12.0, 10.0, 2.0, 4.0, welch=True)
+
+    def test_df(self):
+        ztest = self.setup()
+        assert round(ztest.df, 2) == 27.98
+
+    def test_t(self):
+        ztest = self.setup()
+        # SVE = sqrt(4 / 10 + 16 / 20)
+        assert round(ztest.test_stat, 3) == round(2.0 / np.sqrt(1.2), 3)
+
+    def test_large_samples(self):
+        # Z is used for the p-value, but the Welch df are still given.
+        ztest = ZTest(40, 60, 12.0, 10.0, 2.0, 4.0, welch=True)
+        assert ztest.Z is not None
+        expected = welch_satterthwaite(2.0, 4.0, 40, 60)
+        assert np.isclose(ztest.df, expected)
+        batch = ZTestBatch.from_summary([40, 10], [60, 20], 12.0, 10.0, 2.0, 4.0,
+                                        welch=True)
+        assert np.allclose(batch.df, [expected, welch_satterthwaite(2.0, 4.0, 10, 20)])
+        assert np.isclose(batch.test_stat[0], ztest.Z)
+
+    def test_pvalue_analytic(self):
+        ztest = self.setup()
+        expected = 2 * t_sf(ztest.test_stat, ztest.df)
+        assert np.isclose(ztest.pvalue(rejection=2, backend='analytic'), expected)
+
+    def test_pvalue_directional(self):
+        ztest = self.setup()
+        upper = t_sf(ztest.test_stat, ztest.df)
+        assert np.isclose(ztest.pvalue(rejection=1, backend='analytic'), upper)
+        assert np.isclose(ztest.pvalue(rejection=-1, backend='analytic'), 1 - upper)
+        ztest = ZTest(50, 50, 10.0, 12.0, 2.0, 2.0)
+        assert ztest.test_stat == -5.0
+        assert ztest.pvalue(rejection=-1) < 1e-6
+        assert ztest.pvalue(rejection=1) > 0.999
+
+    def test_batch_from_summary(self):
+        batch = ZTestBatch.from_summary([10, 10, 40], [20, 20, 50],
+                                        [12.0, 11.0, 12.0], 10.0, [2.0, 2.0, 2.0],
+                                        4.0, welch=True, backend='analytic')
+        ztest = self.setup()
+        assert np.isclose(batch.df[0], ztest.df)
+        assert np.isclose(batch.df[2], welch_satterthwaite(2.0, 4.0, 40, 50))
+        assert np.isclose(batch.pvalue[0], ztest.pvalue(backend='analytic'))
+
+
+class TestWilcoxonRankSumFromSamples(object):
+    def test_no_ties(self):
+        x1 = [1.2, 3.4, 0.5]
+        x2 = [2.2, 4.1, 5.0, 0.9]
+        # Ranks of x1 in the pooled sample: 3, 5, 1.
+        wtest = WilcoxonRankSum.from_samples(x1, x2)
+        assert wtest.W1 == 9.0 and wtest.W2 == 19.0
+        assert wtest.s_w == WilcoxonRankSum(3, 4, 9.0, 19.0).s_w
+
+    def test_ties(self):
+        x1 = [1, 2, 2, 3]
+        x2 = [2, 3, 4, 5, 5]
+        wtest = WilcoxonRankSum.from_samples(x1, x2)
+        # Ranks 1, 3, 3, 5.5 and 3, 5.5, 7, 8.5, 8.5.
+        assert wtest.W1 == 12.5
+        # Ties of 3, 2 and 2: sum(t^3 - t) = 24 + 6 + 6.
+        assert wtest.ties == 36.0
+        assert round(wtest.s_w, 4) == round(np.sqrt(20 * 10 / 12. - 20 * 36 / (12. * 9 * 8)), 4)
+
+
+class TestWilcoxonRankSumExact(object):
+    def test_exact(self):
+        x1 = [1.1, 2.3, 0.4]
+        x2 = [5.2, 3.8, 4.4, 6.1]
+        wtest = WilcoxonRankSum.from_samples(x1, x2)
+        # Sample 1 holds the three smallest ranks: 1 of C(7, 3) = 35.
+        assert wtest.pvalue(rejection=-1, exact=True) == pytest.approx(1 / 35.)
+        assert wtest.pvalue(rejection=2, exact=True) == pytest.approx(2 / 35.)
+
+    def test_normal(self):
+        wtest = WilcoxonRankSum(15, 45, 473.5, 1356.5)
+        assert round(wtest.pvalue(rejection=2), 2) == 0.79
+
+    def test_modes_agree_on_direction(self):
+        # Sample 1 (the smaller) holds the lowest ranks.
+        wtest = WilcoxonRankSum.from_samples(np.arange(1, 6), np.arange(6, 12))
+        for exact in (True, False):
+            assert wtest.pvalue(rejection=-1, exact=exact) < 0.01
+            assert wtest.pvalue(rejection=1, exact=exact) > 0.99
+        normal = wtest.pvalue(rejection=1, backend='analytic')
+        assert np.isclose(normal + wtest.pvalue(rejection=-1, backend='analytic'), 1.0)